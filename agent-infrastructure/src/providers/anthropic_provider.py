@@ -34,9 +34,10 @@ class AnthropicProvider(BaseProvider):
         "claude-3-haiku-20240307"
     ]
     
-    def __init__(self, config: AnthropicConfig):
+    def __init__(self, config: AnthropicConfig, client: Optional[anthropic.AsyncAnthropic] = None):
+        """`client` lets several providers share one Anthropic client (and its connection pool)"""
         super().__init__(config)
-        self.client = anthropic.AsyncAnthropic(
+        self.client = client or anthropic.AsyncAnthropic(
             api_key=config.api_key,
             base_url=config.base_url,
             timeout=config.timeout,
@@ -7,13 +7,21 @@ from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
+import anthropic
+import functools
 import os
 import sys
+import structlog
 
-# Add project root to path for imports
+# Add project root and API package to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../../'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 
 from shared.config import get_cors_origins
+from utils.logging_config import configure_logging
+
+configure_logging()
+logger = structlog.get_logger(__name__)
 
 app = FastAPI()
 
@@ -39,10 +47,36 @@ except ImportError as e:
     # Fallback for serverless environment
     pass
 
+# Resolved once per process instead of on every request
+ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
+DEFAULT_MODEL = os.getenv('DEFAULT_MODEL', 'claude-3-5-sonnet-20241022')
+
 # User-scoped agent instances
 user_agents: Dict[str, Agent] = {}
 
 
+@functools.cache
+def _provider_config() -> AnthropicConfig:
+    return AnthropicConfig(api_key=ANTHROPIC_API_KEY, model=DEFAULT_MODEL)
+
+
+@functools.cache
+def _shared_client() -> anthropic.AsyncAnthropic:
+    """
+    Anthropic client shared by every agent's provider
+
+    The client owns the HTTP connection pool, so it is built once per process.
+    Providers stay per agent: each agent registers its own tools on its provider.
+    """
+    config = _provider_config()
+    return anthropic.AsyncAnthropic(
+        api_key=config.api_key,
+        base_url=config.base_url,
+        timeout=config.timeout,
+        max_retries=config.max_retries
+    )
+
+
 class ChatMessage(BaseModel):
     session_id: str
     message: str
@@ -63,12 +97,8 @@ async def get_or_create_agent(project: str, user_id: str, system_prompt: Optiona
     if agent_key in user_agents:
         return user_agents[agent_key]
     
-    # Create provider
-    provider_config = AnthropicConfig(
-        api_key=os.getenv('ANTHROPIC_API_KEY'),
-        model=os.getenv('DEFAULT_MODEL', 'claude-3-5-sonnet-20241022')
-    )
-    provider = AnthropicProvider(provider_config)
+    # One provider per agent (it holds the agent's tools), all on the shared client
+    provider = AnthropicProvider(_provider_config(), client=_shared_client())
     
     # Load external tools for project
     project_tools = []
@@ -87,13 +117,13 @@ async def get_or_create_agent(project: str, user_id: str, system_prompt: Optiona
             external_tools = await external_registry.load_tools_from_endpoint(tools_base_url)
             project_tools.extend(external_tools)
         except Exception as e:
-            print(f"Failed to load external tools: {e}")
+            logger.warning("Failed to load external tools", project=project, error=str(e))
     
     # Create agent config
     agent_config = AgentConfig(
         name=f"{project}-agent-{user_id}",
         system_prompt=system_prompt,
-        model=os.getenv('DEFAULT_MODEL', 'claude-3-5-sonnet-20241022'),
+        model=DEFAULT_MODEL,
         enabled_tools=[tool.name for tool in project_tools] + ["read_file"]
     )
     
@@ -152,7 +182,7 @@ async def chat_stream(message: ChatMessage, request: Request):
         )
         
     except Exception as e:
-        print(f"Streaming chat error: {e}")
+        logger.error("Streaming chat error", error=str(e), user_id=message.user_id)
         raise HTTPException(status_code=500, detail=str(e))
 
 
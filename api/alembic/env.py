@@ -79,14 +79,23 @@ def run_migrations_online() -> None:
         poolclass=pool.NullPool,
         connect_args={
             "connect_timeout": 10,
-            "application_name": "kohtravel_migrations"
+            "application_name": "kohtravel_migrations",
+            # Abort runaway migrations instead of holding locks that block the API
+            "options": (
+                "-c statement_timeout=30000 "
+                "-c lock_timeout=5000 "
+                "-c idle_in_transaction_session_timeout=15000"
+            )
         }
     )
 
     with connectable.connect() as connection:
+        # Commit each migration separately so CONCURRENTLY statements can run
+        # in autocommit mode (see utils.migration_helpers.execute_concurrently)
         context.configure(
             connection=connection, 
-            target_metadata=target_metadata
+            target_metadata=target_metadata,
+            transaction_per_migration=True
         )
 
         with context.begin_transaction():
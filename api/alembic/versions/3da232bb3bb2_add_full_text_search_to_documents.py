@@ -0,0 +1,40 @@
+"""Add weighted full-text search column and GIN index to documents
+
+Revision ID: 3da232bb3bb2
+Revises: 6dde2fa7c832
+Create Date: 2025-09-08 10:12:41.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from utils.migration_helpers import execute_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3da232bb3bb2'
+down_revision: Union[str, Sequence[str], None] = '6dde2fa7c832'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        ALTER TABLE documents ADD COLUMN search_tsv tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(summary, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(raw_text, '')), 'C') ||
+            setweight(to_tsvector('simple', coalesce(structured_data::text, '')), 'D')
+        ) STORED
+    """)
+    execute_concurrently("CREATE INDEX CONCURRENTLY IF NOT EXISTS documents_search_tsv_idx ON documents USING gin (search_tsv)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    execute_concurrently("DROP INDEX CONCURRENTLY IF EXISTS documents_search_tsv_idx")
+    op.drop_column('documents', 'search_tsv')
@@ -0,0 +1,35 @@
+"""Add pg_trgm GIN indexes for substring document search
+
+Revision ID: 8f41c2d7ab90
+Revises: 3da232bb3bb2
+Create Date: 2025-09-08 11:03:27.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from utils.migration_helpers import execute_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f41c2d7ab90'
+down_revision: Union[str, Sequence[str], None] = '3da232bb3bb2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    execute_concurrently("CREATE INDEX CONCURRENTLY IF NOT EXISTS documents_raw_text_trgm ON documents USING gin (raw_text gin_trgm_ops)")
+    execute_concurrently("CREATE INDEX CONCURRENTLY IF NOT EXISTS documents_title_trgm ON documents USING gin (title gin_trgm_ops)")
+    execute_concurrently("CREATE INDEX CONCURRENTLY IF NOT EXISTS documents_summary_trgm ON documents USING gin (summary gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('documents_summary_trgm', table_name='documents')
+    op.drop_index('documents_title_trgm', table_name='documents')
+    op.drop_index('documents_raw_text_trgm', table_name='documents')
@@ -0,0 +1,39 @@
+"""Add composite (user_id, ...) indexes for per-user document and calendar queries
+
+Revision ID: c3f8d1e6a470
+Revises: 8f41c2d7ab90
+Create Date: 2025-09-08 16:42:51.118304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from utils.migration_helpers import execute_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8d1e6a470'
+down_revision: Union[str, Sequence[str], None] = '8f41c2d7ab90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Newest-first listings with id for keyset pagination; title and category_id are
+    # included so the travel summary's recent documents are an index-only scan
+    execute_concurrently(
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS documents_user_recent_idx "
+        "ON documents (user_id, created_at DESC, id DESC) INCLUDE (title, category_id)"
+    )
+    execute_concurrently("CREATE INDEX CONCURRENTLY IF NOT EXISTS documents_user_category_idx ON documents (user_id, category_id)")
+    execute_concurrently("CREATE INDEX CONCURRENTLY IF NOT EXISTS calendar_events_user_start_idx ON calendar_events (user_id, start_datetime)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('calendar_events_user_start_idx', table_name='calendar_events')
+    op.drop_index('documents_user_category_idx', table_name='documents')
+    op.drop_index('documents_user_recent_idx', table_name='documents')
@@ -0,0 +1,33 @@
+"""Add partial index for pending suggested calendar events
+
+Revision ID: e8a2c4f61b37
+Revises: c3f8d1e6a470
+Create Date: 2025-09-09 14:27:05.381942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from utils.migration_helpers import execute_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a2c4f61b37'
+down_revision: Union[str, Sequence[str], None] = 'c3f8d1e6a470'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    execute_concurrently(
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS calendar_events_user_suggested_idx "
+        "ON calendar_events (user_id, start_datetime) WHERE status = 'suggested'"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    execute_concurrently("DROP INDEX CONCURRENTLY IF EXISTS calendar_events_user_suggested_idx")
@@ -1,7 +1,9 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
+import re
 from dotenv import load_dotenv
 
 # Load development environment by default
@@ -20,15 +22,40 @@ if "railway" in DATABASE_URL.lower() or "rlwy.net" in DATABASE_URL.lower():
         "sslmode": "disable"
     }
 
+# Recycle stale connections (e.g. dropped by PgBouncer after idle periods) before use
+engine_kwargs["pool_pre_ping"] = True
+
+# Room for every compiled statement shape the API and agent tools issue
+engine_kwargs["query_cache_size"] = 1200
+
 engine = create_engine(DATABASE_URL, **engine_kwargs)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg) for read paths that must not block the event loop.
+# The sync engine above stays in use for Alembic and the remaining routes.
+ASYNC_DATABASE_URL = re.sub(r"^postgresql(\+\w+)?://", "postgresql+asyncpg://", DATABASE_URL)
+
+async_engine_kwargs = {"pool_size": 5, "max_overflow": 10, "pool_pre_ping": True, "query_cache_size": 1200}
+
+# Keep every hot statement prepared server-side per connection (asyncpg's
+# default LRU of 100 is smaller than the number of statement shapes we issue)
+async_engine_kwargs["connect_args"] = {
+    "prepared_statement_cache_size": 500
+}
+if "railway" in DATABASE_URL.lower() or "rlwy.net" in DATABASE_URL.lower():
+    async_engine_kwargs["connect_args"]["ssl"] = False
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **async_engine_kwargs)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
+    """Dependency to get database session (rolled back and closed on exit)"""
+    with SessionLocal() as db:
+        yield db
+
+async def get_async_db():
+    """Dependency to get async database session"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
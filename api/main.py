@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 import os
 import re
 
@@ -8,11 +9,20 @@ from routes.documents import router as documents_router
 from routes.agent_tools import router as agent_tools_router
 from routes.agent_chat import router as agent_chat_router
 from routes.calendar import router as calendar_router
+from utils.logging_config import configure_logging
+
+# Log IO happens on a background thread, off the event loop. Repeated errors beyond
+# LOG_MAX_ERRORS_PER_SECOND (per event and error text) are sampled; 0 disables it.
+configure_logging(
+    max_events_per_second=int(os.getenv("LOG_MAX_ERRORS_PER_SECOND", "100")),
+    background=True
+)
 
 app = FastAPI(
     title="KohTravel API",
     description="Travel planning and management API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Auto-solve CORS as requested - supports multiple development instances
@@ -46,6 +56,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Document payloads (raw text, summaries, structured data) are text-heavy.
+# Event streams are left uncompressed by the middleware so they keep flushing.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # For Vercel serverless deployment:
 # - Migrations should be run manually or via CI/CD before deployment
 # - Each serverless function is stateless and ephemeral
@@ -58,20 +72,23 @@ app.include_router(agent_chat_router, prefix="/api/agent", tags=["agent-chat"])
 app.include_router(calendar_router, tags=["calendar"])
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "KohTravel API is running", "status": "healthy"}
 
-@app.get("/api/health")
-def health_check():
-    return {"status": "ok", "service": "KohTravel API"}
+# Static health payload, returned as-is on every poll
+_HEALTH = {"status": "ok", "service": "KohTravel API"}
+
+@app.get("/api/health", response_class=ORJSONResponse)
+async def health_check():
+    return _HEALTH
 
 @app.get("/api/travels")
-def get_travels():
+async def get_travels():
     # Placeholder endpoint for travel data
     return {"travels": [], "message": "Travel data endpoint ready"}
 
 @app.get("/api/destinations")
-def get_destinations():
+async def get_destinations():
     # Placeholder endpoint for destinations
     return {"destinations": [], "message": "Destinations endpoint ready"}
 
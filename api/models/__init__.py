@@ -2,12 +2,13 @@
 
 from .user import User
 from .document import Document, DocumentCategory, DocumentQuickRef
-from .calendar_event import CalendarEvent
+from .calendar_event import CalendarEvent, CalendarEventOut
 
 __all__ = [
     "User",
     "Document", 
     "DocumentCategory",
     "DocumentQuickRef",
-    "CalendarEvent"
+    "CalendarEvent",
+    "CalendarEventOut"
 ]
\ No newline at end of file
@@ -1,9 +1,25 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Boolean, func
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Boolean, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from types import MappingProxyType
+from typing import Optional
 import uuid
 from database import Base
 
+# Default UI color (Tailwind class) per event type; the keys are the valid event types
+EVENT_COLORS = MappingProxyType({
+    "flight": "bg-blue-500",
+    "accommodation": "bg-green-500",
+    "activity": "bg-purple-500",
+    "transport": "bg-cyan-500",
+    "dining": "bg-yellow-500",
+    "wellness": "bg-pink-500",
+})
+EVENT_TYPES = frozenset(EVENT_COLORS)
+DEFAULT_EVENT_COLOR = "bg-gray-500"
+
 class CalendarEvent(Base):
     __tablename__ = "calendar_events"
     
@@ -43,6 +59,20 @@ class CalendarEvent(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
+    __table_args__ = (
+        # Per-user calendar range queries ordered by start time
+        Index("calendar_events_user_start_idx", "user_id", "start_datetime"),
+        # Pending suggestions (carousel count, suggested events list)
+        Index(
+            "calendar_events_user_suggested_idx", "user_id", "start_datetime",
+            postgresql_where=text("status = 'suggested'")
+        ),
+    )
+    
+    # Fetch created_at/updated_at with INSERT/UPDATE ... RETURNING during flush,
+    # so writes don't need a follow-up SELECT (db.refresh) to serialize the row
+    __mapper_args__ = {"eager_defaults": True}
+    
     # Relationships
     user = relationship("User", back_populates="calendar_events")
     document = relationship("Document", backref="calendar_events")
@@ -53,27 +83,28 @@ class CalendarEvent(Base):
     def __repr__(self):
         return f"<CalendarEvent(id={self.id}, title={self.title}, type={self.event_type}, start={self.start_datetime})>"
 
-    def to_dict(self):
-        """Convert model to dictionary for API responses"""
-        return {
-            "id": str(self.id),
-            "title": self.title,
-            "description": self.description,
-            "location": self.location,
-            "start_datetime": self.start_datetime.isoformat() if self.start_datetime else None,
-            "end_datetime": self.end_datetime.isoformat() if self.end_datetime else None,
-            "all_day": self.all_day,
-            "event_type": self.event_type,
-            "color": self.color,
-            "status": self.status,
-            "notes": self.notes,
-            "source": self.source,
-            "document_id": str(self.document_id) if self.document_id else None,
-            "suggestion_reason": self.suggestion_reason,
-            "suggestion_confidence": self.suggestion_confidence,
-            "user_feedback": self.user_feedback,
-            "suggested_by": self.suggested_by,
-            "parent_event_id": str(self.parent_event_id) if self.parent_event_id else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+
+class CalendarEventOut(BaseModel):
+    """API representation of a calendar event, read directly from the ORM row"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    title: str
+    description: Optional[str] = None
+    location: Optional[str] = None
+    start_datetime: datetime
+    end_datetime: Optional[datetime] = None
+    all_day: Optional[bool] = False
+    event_type: str
+    color: Optional[str] = None
+    status: Optional[str] = None
+    notes: Optional[str] = None
+    source: Optional[str] = None
+    document_id: Optional[uuid.UUID] = None
+    suggestion_reason: Optional[str] = None
+    suggestion_confidence: Optional[int] = None
+    user_feedback: Optional[str] = None
+    suggested_by: Optional[str] = None
+    parent_event_id: Optional[uuid.UUID] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
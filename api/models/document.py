@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, JSON, func
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, JSON, Computed, Index, func, text
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 import uuid
 from database import Base
 
@@ -38,6 +38,37 @@ class Document(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
+    # Full-text search vector, maintained by PostgreSQL on every INSERT/UPDATE.
+    # Fields are weighted A (title) > B (summary) > C (raw text) > D (structured data).
+    # Deferred: it is only ever read inside SQL (ranking and @@ filters), never in Python.
+    search_tsv = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(summary, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(raw_text, '')), 'C') || "
+            "setweight(to_tsvector('simple', coalesce(structured_data::text, '')), 'D')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    
+    __table_args__ = (
+        # Per-user listings (newest first, id for keyset pagination); title and category
+        # are included so the travel summary's recent documents are an index-only scan
+        Index(
+            "documents_user_recent_idx", "user_id", text("created_at DESC"), text("id DESC"),
+            postgresql_include=["title", "category_id"]
+        ),
+        # Category breakdowns
+        Index("documents_user_category_idx", "user_id", "category_id"),
+        Index("documents_search_tsv_idx", "search_tsv", postgresql_using="gin"),
+        # Trigram indexes keep substring ILIKE matches (e.g. "LH12" in "LH123") index-backed
+        Index("documents_raw_text_trgm", "raw_text", postgresql_using="gin", postgresql_ops={"raw_text": "gin_trgm_ops"}),
+        Index("documents_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("documents_summary_trgm", "summary", postgresql_using="gin", postgresql_ops={"summary": "gin_trgm_ops"}),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="documents")
     category = relationship("DocumentCategory", back_populates="documents")
@@ -1,6 +1,8 @@
 from sqlalchemy import Column, String, DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
 import uuid
 from database import Base
 
@@ -18,4 +20,13 @@ class User(Base):
     calendar_events = relationship("CalendarEvent", back_populates="user", cascade="all, delete-orphan")
     
     def __repr__(self):
-        return f"<User(id={self.id}, email={self.email})>"
\ No newline at end of file
+        return f"<User(id={self.id}, email={self.email})>"
+
+
+class AuthenticatedUser(BaseModel):
+    """Immutable snapshot of the signed-in user, safe to cache across requests and sessions"""
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    id: uuid.UUID
+    email: Optional[str] = None
+    name: Optional[str] = None
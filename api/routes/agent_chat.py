@@ -5,15 +5,15 @@ import httpx
 import os
 from fastapi import APIRouter, HTTPException, Depends, Request
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
 import structlog
 
-from database import get_db
+from database import get_async_db
 from services.auth import get_current_user
 from services.context_service import TravelContextService
-from models.user import User
+from models.user import AuthenticatedUser
 
 logger = structlog.get_logger(__name__)
 
@@ -31,8 +31,9 @@ class ChatRequest(BaseModel):
 @router.post("/chat/stream")
 async def chat_with_context(
     request: ChatRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    http_request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
     Chat with agent including KohTravel-specific context
@@ -64,34 +65,51 @@ async def chat_with_context(
         # Get agent infrastructure URL
         agent_url = os.getenv("AGENT_INFRASTRUCTURE_URL", "http://localhost:8001")
         
-        # Forward to agent infrastructure with enhanced context
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{agent_url}/api/agent/chat/stream",
-                json=agent_request,
-                timeout=120.0
+        # Forward to agent infrastructure with enhanced context. The client and
+        # upstream response stay open until the generator below finishes.
+        client = httpx.AsyncClient(timeout=120.0)
+        try:
+            response = await client.send(
+                client.build_request("POST", f"{agent_url}/api/agent/chat/stream", json=agent_request),
+                stream=True
             )
-            
-            if not response.is_success:
-                logger.error("Agent infrastructure error", 
-                           status_code=response.status_code,
-                           response_text=response.text)
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Agent infrastructure error: {response.text}"
-                )
-            
-            # Stream the response back to frontend
-            async def generate():
+        except BaseException:
+            await client.aclose()
+            raise
+        
+        if not response.is_success:
+            response_text = (await response.aread()).decode(errors="replace")
+            await response.aclose()
+            await client.aclose()
+            logger.error("Agent infrastructure error", 
+                       status_code=response.status_code,
+                       response_text=response_text)
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Agent infrastructure error: {response_text}"
+            )
+        
+        # Stream the response back to frontend, releasing the upstream stream
+        # as soon as the client goes away (GeneratorExit / cancellation)
+        async def generate():
+            try:
                 async for chunk in response.aiter_bytes():
+                    if await http_request.is_disconnected():
+                        logger.info("Client disconnected from chat stream", user_id=current_user.email)
+                        break
                     yield chunk
-                    
-            return StreamingResponse(
-                generate(),
-                media_type=response.headers.get("content-type", "text/plain"),
-                headers={"Cache-Control": "no-cache"}
-            )
+            finally:
+                await response.aclose()
+                await client.aclose()
+                
+        return StreamingResponse(
+            generate(),
+            media_type=response.headers.get("content-type", "text/plain"),
+            headers={"Cache-Control": "no-cache"}
+        )
             
+    except HTTPException:
+        raise
     except httpx.TimeoutException:
         logger.error("Agent infrastructure timeout", user_id=current_user.email)
         raise HTTPException(status_code=504, detail="Agent service timeout")
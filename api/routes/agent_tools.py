@@ -1,17 +1,27 @@
 """
 Agent tools endpoints for KohTravel-specific functionality
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from sqlalchemy import String
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm import defer, raiseload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Integer, Text, case, cast, delete, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+import logging
+import orjson
 import structlog
 
-from database import get_db
+from database import get_async_db
+from services.category_cache import cache_categories, get_cached_categories
+from services.document_refs import is_document_ref, make_document_ref, resolve_document_ref
+from services.search_cache import cache_search, get_cached_search
+from services.search_ranking import term_frequencies_column, document_length_column, weighted_rank, rank_bm25
+from services.user_migration import UserMigrationService
 from models.document import Document, DocumentCategory, DocumentQuickRef
 from models.user import User
-from models.calendar_event import CalendarEvent
+from models.calendar_event import CalendarEvent, CalendarEventOut, EVENT_COLORS, EVENT_TYPES, DEFAULT_EVENT_COLOR
 import uuid
 from datetime import datetime, date
 
@@ -19,6 +29,36 @@ logger = structlog.get_logger(__name__)
 
 router = APIRouter()
 
+# BM25 re-ranks this many FTS candidates per requested result
+SEARCH_CANDIDATE_FACTOR = 5
+SEARCH_CANDIDATE_MAX = 200
+
+# get_document streams full-mode responses whose raw_text is longer than this
+STREAM_RAW_TEXT_THRESHOLD = 64_000
+STREAM_CHUNK_SIZE = 65_536
+
+# search_and_fetch returns at most this many documents inline
+SEARCH_AND_FETCH_MAX = 3
+
+# ts_headline options for get_document snippet mode (~1 KB of excerpts)
+SNIPPET_HEADLINE_OPTIONS = "MaxFragments=3, MaxWords=30, MinWords=10, StartSel=**, StopSel=**"
+
+# Plain event fields update_calendar_event copies from the tool parameters
+UPDATABLE_EVENT_FIELDS = ("title", "description", "location", "event_type", "status", "notes", "all_day")
+
+# Upper bound on events per suggest_calendar_events_bulk call
+SUGGEST_BULK_MAX = 20
+
+# Validates/serializes a whole list of events in one pydantic-core call
+CALENDAR_EVENT_LIST_ADAPTER = TypeAdapter(List[CalendarEventOut])
+
+
+def _json_fragment(raw_json: Optional[str]) -> Any:
+    """Embed JSON text fetched from Postgres into an orjson response without re-parsing it"""
+    if not raw_json or raw_json == "null":
+        return {}
+    return orjson.Fragment(raw_json)
+
 
 class ToolRequest(BaseModel):
     user_id: str  # This will be email from the agent
@@ -34,8 +74,194 @@ class ToolResponse(BaseModel):
     error: Optional[str] = None
 
 
+# Fixed validation failures, built once and returned as-is
+AUTH_FAILED_RESPONSE = ToolResponse(success=False, content="User authentication failed", error="auth_failed")
+MISSING_QUERY_RESPONSE = ToolResponse(success=False, content="Search query is required", error="missing_query")
+MISSING_DOCUMENT_ID_RESPONSE = ToolResponse(success=False, content="Document ID is required", error="missing_document_id")
+MISSING_EVENT_ID_RESPONSE = ToolResponse(success=False, content="Event ID is required", error="missing_event_id")
+MISSING_TITLE_RESPONSE = ToolResponse(success=False, content="Event title is required", error="missing_title")
+MISSING_START_DATETIME_RESPONSE = ToolResponse(success=False, content="Event start_datetime is required", error="missing_start_datetime")
+MISSING_SUGGESTION_REASON_RESPONSE = ToolResponse(success=False, content="Suggestion reason is required for suggested events", error="missing_suggestion_reason")
+
+# show_suggested_events_carousel reply when the caller opts out of the count
+CAROUSEL_SKIP_COUNT_RESPONSE = ToolResponse(
+    success=True,
+    content="Showing suggested events carousel for your review.",
+    metadata={"action": "show_carousel"}
+)
+
+
+async def _search_documents(
+    db: AsyncSession,
+    user_uuid: str,
+    query: str,
+    category: Optional[str],
+    limit: int
+) -> List[Any]:
+    """Search a user's documents, best matches first"""
+    # Build query for user's documents only. Full-text matches whole tokens;
+    # the trigram-indexed ILIKE terms keep partial matches like flight codes
+    # (with % and _ in the query escaped, so they match literally).
+    ts_query = func.plainto_tsquery("simple", query)
+    stmt = select(
+        Document.id,
+        Document.title,
+        Document.original_filename,
+        Document.summary,
+        # Raw JSON text, passed through to the response without a parse/emit round-trip
+        cast(Document.structured_data, Text).label("structured_data_json"),
+        Document.created_at,
+        DocumentCategory.name.label("category"),
+        term_frequencies_column(query),
+        document_length_column()
+    ).join(
+        DocumentCategory, Document.category_id == DocumentCategory.id, isouter=True
+    ).where(
+        Document.user_id == user_uuid
+    ).where(
+        # search_tsv covers raw text, title, summary and structured data
+        Document.search_tsv.op("@@")(ts_query) |
+        Document.title.icontains(query, autoescape=True) |
+        Document.summary.icontains(query, autoescape=True) |
+        Document.raw_text.icontains(query, autoescape=True)
+    )
+    
+    # Filter by category if specified
+    if category:
+        stmt = stmt.where(DocumentCategory.name.icontains(category, autoescape=True))
+    
+    # Fetch a wider candidate pool by field-weighted ts_rank_cd, then re-rank it with BM25F
+    stmt = stmt.order_by(
+        weighted_rank(ts_query).desc(),
+        Document.created_at.desc()
+    ).limit(min(limit * SEARCH_CANDIDATE_FACTOR, SEARCH_CANDIDATE_MAX))
+    candidates = (await db.execute(stmt)).all()
+    return await rank_bm25(candidates, user_uuid, db, limit)
+
+
+def _json_string_chunks(*parts: str) -> Iterator[bytes]:
+    """Encode the concatenation of `parts` as one JSON string literal, chunk by chunk"""
+    yield b'"'
+    for part in parts:
+        for i in range(0, len(part), STREAM_CHUNK_SIZE):
+            # orjson escapes per character, so encoding slices separately is safe
+            yield orjson.dumps(part[i:i + STREAM_CHUNK_SIZE])[1:-1]
+    yield b'"'
+
+
+def _stream_document_response(content_prefix: str, raw_text: str, doc_data: Dict[str, Any]) -> StreamingResponse:
+    """
+    Stream a get_document ToolResponse whose content ends with raw_text
+
+    Produces the same JSON as the ToolResponse path, with raw_text in both
+    `content` and `metadata.document.content`.
+    """
+    def body() -> Iterator[bytes]:
+        yield b'{"success":true,"content":'
+        yield from _json_string_chunks(content_prefix, raw_text)
+        # Reopen the serialized document dict to append its content field
+        yield b',"metadata":{"document":' + orjson.dumps(doc_data)[:-1] + b',"content":'
+        yield from _json_string_chunks(raw_text)
+        yield b'}},"error":null}'
+    
+    return StreamingResponse(body(), media_type="application/json")
+
+
+def _search_result(result: Any) -> Dict[str, Any]:
+    """Format a _search_documents row for tool responses"""
+    return {
+        "id": str(result.id),
+        "ref": make_document_ref(result.id),  # Signed reference for LLM
+        "title": result.title,
+        "filename": result.original_filename,
+        "summary": result.summary,
+        "category": result.category,
+        "created_at": result.created_at.isoformat() if result.created_at else None,
+        "structured_data": _json_fragment(result.structured_data_json)
+    }
+
+
+def _build_suggested_event(parameters: Dict[str, Any], user_uuid: Any) -> Tuple[Optional[CalendarEvent], Optional[ToolResponse]]:
+    """
+    Validate suggest_calendar_event parameters and build the (unsaved) event
+
+    Returns (event, None) on success or (None, error response) when validation fails.
+    """
+    title = parameters.get("title")
+    start_datetime = parameters.get("start_datetime")
+    event_type = parameters.get("event_type", "activity")
+    suggestion_reason = parameters.get("suggestion_reason")
+    suggestion_confidence = parameters.get("suggestion_confidence", 7)
+    
+    if not title:
+        return None, MISSING_TITLE_RESPONSE
+    
+    if not start_datetime:
+        return None, MISSING_START_DATETIME_RESPONSE
+        
+    if not suggestion_reason:
+        return None, MISSING_SUGGESTION_REASON_RESPONSE
+    
+    # Validate event type
+    if event_type not in EVENT_TYPES:
+        return None, ToolResponse(
+            success=False,
+            content=f"Invalid event_type '{event_type}'. Must be one of: {', '.join(EVENT_COLORS)}",
+            error="invalid_event_type"
+        )
+    
+    # Validate confidence score
+    if not isinstance(suggestion_confidence, int) or not (1 <= suggestion_confidence <= 10):
+        return None, ToolResponse(
+            success=False,
+            content="Suggestion confidence must be an integer between 1 and 10",
+            error="invalid_confidence"
+        )
+    
+    # Parse datetime
+    try:
+        start_dt = datetime.fromisoformat(start_datetime)
+    except ValueError:
+        return None, ToolResponse(
+            success=False,
+            content=f"Invalid start_datetime format: {start_datetime}. Use ISO format (YYYY-MM-DDTHH:MM:SS)",
+            error="invalid_datetime_format"
+        )
+    
+    # Parse end_datetime if provided
+    end_dt = None
+    end_datetime = parameters.get("end_datetime")
+    if end_datetime:
+        try:
+            end_dt = datetime.fromisoformat(end_datetime)
+        except ValueError:
+            return None, ToolResponse(
+                success=False,
+                content=f"Invalid end_datetime format: {end_datetime}. Use ISO format (YYYY-MM-DDTHH:MM:SS)",
+                error="invalid_datetime_format"
+            )
+    
+    return CalendarEvent(
+        user_id=user_uuid,
+        title=title,
+        description=parameters.get("description"),
+        location=parameters.get("location"),
+        start_datetime=start_dt,
+        end_datetime=end_dt,
+        all_day=parameters.get("all_day", False),
+        event_type=event_type,
+        color=parameters.get("color", EVENT_COLORS.get(event_type, DEFAULT_EVENT_COLOR)),
+        status="suggested",  # Always suggested for these tools
+        notes=parameters.get("notes"),
+        source="agent_suggested",
+        suggestion_reason=suggestion_reason,
+        suggestion_confidence=suggestion_confidence,
+        suggested_by="agent"
+    ), None
+
+
 @router.post("/search_documents", response_model=ToolResponse)
-async def search_user_documents(request: ToolRequest, db: Session = Depends(get_db)):
+async def search_user_documents(request: ToolRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Search through user's uploaded documents
     Only returns documents belonging to the authenticated user
@@ -53,75 +279,29 @@ async def search_user_documents(request: ToolRequest, db: Session = Depends(get_
                    user_id=request.user_id)
         
         if not query:
-            return ToolResponse(
-                success=False,
-                content="Search query is required",
-                error="missing_query"
-            )
+            return MISSING_QUERY_RESPONSE
         
         # Get user with proper migration handling
-        from services.user_migration import UserMigrationService
         user_uuid = await UserMigrationService.get_accessible_user_id(request.user_id, db)
         if not user_uuid:
-            return ToolResponse(
-                success=False,
-                content="User authentication failed",
-                error="auth_failed"
-            )
+            return AUTH_FAILED_RESPONSE
         
-        # Build query for user's documents only
-        db_query = db.query(
-            Document.id,
-            Document.title,
-            Document.original_filename,
-            Document.summary,
-            Document.structured_data,
-            Document.created_at,
-            DocumentCategory.name.label("category")
-        ).join(
-            DocumentCategory, Document.category_id == DocumentCategory.id, isouter=True
-        ).filter(
-            Document.user_id == user_uuid
-        ).filter(
-            # Search in multiple fields including structured data
-            Document.raw_text.ilike(f"%{query}%") |
-            Document.title.ilike(f"%{query}%") |
-            Document.summary.ilike(f"%{query}%") |
-            Document.structured_data.cast(String).ilike(f"%{query}%")
-        )
-        
-        # Filter by category if specified
-        if category:
-            db_query = db_query.filter(DocumentCategory.name.ilike(f"%{category}%"))
-        
-        # Execute query
-        results = db_query.order_by(Document.created_at.desc()).limit(limit).all()
+        search_key = (query, category, limit)
+        cached = get_cached_search(user_uuid, search_key)
+        if cached is not None:
+            logger.info("Search served from cache", query=query, user_id=request.user_id)
+            return Response(content=cached, media_type="application/json")
         
-        # Log query results for debugging
-        logger.info("Search query executed", 
-                   query=query,
-                   results_found=len(results),
-                   result_titles=[r.title for r in results[:3]])  # Log first 3 titles
+        results = await _search_documents(db, user_uuid, query, category, limit)
         
         # Format results with document references
-        documents = []
-        for idx, result in enumerate(results):
-            doc = {
-                "id": str(result.id),
-                "ref": f"doc_{idx + 1}",  # Simple reference for LLM
-                "title": result.title,
-                "filename": result.original_filename,
-                "summary": result.summary,
-                "category": result.category,
-                "created_at": result.created_at.isoformat() if result.created_at else None,
-                "structured_data": result.structured_data or {}
-            }
-            documents.append(doc)
+        documents = [_search_result(result) for result in results]
         
-        # Debug logging
-        logger.info("Search documents result", 
-                   document_count=len(documents), 
-                   sample_ids=[doc["id"] for doc in documents[:3]])
+        logger.info("Search query executed", query=query, results_found=len(results))
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug("Search documents result",
+                         result_titles=[r.title for r in results[:3]],
+                         sample_ids=[doc["id"] for doc in documents[:3]])
         
         # Create more informative content for the agent
         if documents:
@@ -142,7 +322,8 @@ async def search_user_documents(request: ToolRequest, db: Session = Depends(get_
             content = f"No documents found matching '{query}'" + \
                      (f" in category '{category}'" if category else "")
         
-        return ToolResponse(
+        # Encoded directly so orjson can emit the JSON fragments as-is
+        body = orjson.dumps(ToolResponse(
             success=True,
             content=content,
             metadata={
@@ -151,7 +332,9 @@ async def search_user_documents(request: ToolRequest, db: Session = Depends(get_
                 "search_query": query,
                 "category_filter": category
             }
-        )
+        ).model_dump())
+        cache_search(user_uuid, search_key, body)
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
         logger.error("Document search failed", error=str(e), user_id=request.user_id)
@@ -162,66 +345,148 @@ async def search_user_documents(request: ToolRequest, db: Session = Depends(get_
         )
 
 
+@router.post("/search_and_fetch", response_model=ToolResponse)
+async def search_and_fetch_documents(request: ToolRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Search user's documents and return the best matches with their details inline
+    
+    Saves the agent the usual follow-up get_document call: the top match comes
+    back with its full text, the rest with excerpts matching the query.
+    """
+    try:
+        query = request.parameters.get("query", "")
+        category = request.parameters.get("category")
+        limit = min(request.parameters.get("limit", SEARCH_AND_FETCH_MAX), SEARCH_AND_FETCH_MAX)
+        
+        logger.info("Search and fetch request", 
+                   query=query, 
+                   category=category,
+                   user_id=request.user_id)
+        
+        if not query:
+            return MISSING_QUERY_RESPONSE
+        
+        # Get user with proper migration handling
+        user_uuid = await UserMigrationService.get_accessible_user_id(request.user_id, db)
+        if not user_uuid:
+            return AUTH_FAILED_RESPONSE
+        
+        results = await _search_documents(db, user_uuid, query, category, limit)
+        if not results:
+            return ToolResponse(
+                success=True,
+                content=f"No documents found matching '{query}'" + \
+                        (f" in category '{category}'" if category else ""),
+                metadata={"documents": [], "count": 0, "search_query": query, "category_filter": category}
+            )
+        
+        # Excerpts for every match plus the top match's full text in one query
+        top_id = results[0].id
+        details = (await db.execute(
+            select(
+                Document.id,
+                func.ts_headline(
+                    "simple",
+                    func.coalesce(Document.raw_text, ""),
+                    func.plainto_tsquery("simple", query),
+                    SNIPPET_HEADLINE_OPTIONS
+                ).label("snippet"),
+                case((Document.id == top_id, Document.raw_text)).label("raw_text")
+            ).where(
+                Document.id.in_([result.id for result in results]),
+                Document.user_id == user_uuid
+            )
+        )).all()
+        details_by_id = {row.id: row for row in details}
+        
+        documents = []
+        for result in results:
+            doc = _search_result(result)
+            doc["snippet"] = details_by_id[result.id].snippet
+            documents.append(doc)
+        top = documents[0]
+        top["content"] = details_by_id[top_id].raw_text
+        
+        content = f"Found {len(documents)} documents matching '{query}'" + \
+                  (f" in category '{category}'" if category else "") + ":\n\n"
+        content += f"Top match: {top['title']} ({top['ref']})\n\n"
+        content += f"Summary: {top['summary']}\n\n"
+        content += f"Full Document Content:\n{top['content']}"
+        if len(documents) > 1:
+            content += "\n\nOther matches:\n" + "\n".join(
+                f"- {doc['ref']} ({doc['id']}): {doc['title']} - {doc['snippet']}"
+                for doc in documents[1:]
+            )
+        
+        logger.info("Search and fetch executed", 
+                   query=query,
+                   results_found=len(documents),
+                   top_document_id=top["id"])
+        
+        # Returned as a response directly so orjson can emit the JSON fragments as-is
+        return ORJSONResponse(ToolResponse(
+            success=True,
+            content=content,
+            metadata={
+                "documents": documents,
+                "document": top,
+                "count": len(documents),
+                "search_query": query,
+                "category_filter": category
+            }
+        ).model_dump())
+        
+    except Exception as e:
+        logger.error("Search and fetch failed", error=str(e), user_id=request.user_id)
+        return ToolResponse(
+            success=False,
+            content=f"Document search failed: {str(e)}",
+            error=str(e)
+        )
+
+
 @router.post("/get_document", response_model=ToolResponse)
-async def get_user_document(request: ToolRequest, db: Session = Depends(get_db)):
+async def get_user_document(request: ToolRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Get specific document by ID (user-scoped)
     """
     try:
         document_id = request.parameters.get("document_id")
+        mode = request.parameters.get("mode", "snippet")
+        snippet_query = request.parameters.get("query")
         
         if not document_id:
+            return MISSING_DOCUMENT_ID_RESPONSE
+        
+        if mode not in ("snippet", "full"):
             return ToolResponse(
                 success=False,
-                content="Document ID is required",
-                error="missing_document_id"
+                content=f"Invalid mode '{mode}'. Use 'snippet' or 'full'",
+                error="invalid_mode"
             )
         
         # Debug logging
         logger.info("Get document request", 
                    document_id=document_id, 
+                   mode=mode,
                    user_id=request.user_id)
         
         # Get user with proper migration handling
-        from services.user_migration import UserMigrationService
         user_uuid = await UserMigrationService.get_accessible_user_id(request.user_id, db)
         if not user_uuid:
-            return ToolResponse(
-                success=False,
-                content="User authentication failed",
-                error="auth_failed"
-            )
+            return AUTH_FAILED_RESPONSE
         
-        # Handle both ref format (doc_1) and UUID format
-        if isinstance(document_id, str) and document_id.startswith("doc_"):
-            # This is a reference format, need to resolve to actual UUID
-            # Get recent search results to map ref to UUID
-            try:
-                ref_num = int(document_id.replace("doc_", ""))
-                
-                # Get user documents to find the one at this index
-                db_query = db.query(Document).filter(
-                    Document.user_id == user_uuid
-                ).order_by(Document.created_at.desc())
-                
-                # Get the document at the specified index (1-based)
-                target_document = db_query.offset(ref_num - 1).limit(1).first()
-                
-                if not target_document:
-                    return ToolResponse(
-                        success=False,
-                        content=f"Document reference {document_id} not found",
-                        error="document_ref_not_found"
-                    )
-                
-                document_id = target_document.id
-                
-            except (ValueError, IndexError):
+        # Handle both ref format (doc_...) and UUID format
+        if is_document_ref(document_id):
+            # Refs carry the signed document UUID - no lookup needed
+            resolved_id = resolve_document_ref(document_id)
+            if not resolved_id:
                 return ToolResponse(
                     success=False,
-                    content=f"Invalid document reference format: {document_id}",
-                    error="invalid_ref_format"
+                    content=f"Document reference {document_id} is invalid or has expired - run search_documents again",
+                    error="invalid_ref"
                 )
+            document_id = resolved_id
         else:
             # Convert document_id to UUID if it's a string UUID
             try:
@@ -234,54 +499,93 @@ async def get_user_document(request: ToolRequest, db: Session = Depends(get_db))
                     error="invalid_uuid"
                 )
         
-        # Get document only if it belongs to the user
-        document = db.query(Document).filter(
+        # Get document (with its category name) only if it belongs to the user.
+        # Snippet mode never loads raw_text - Postgres cuts the excerpts itself.
+        # structured_data comes back as raw JSON text and is passed through as-is.
+        columns = [
+            Document,
+            DocumentCategory.name.label("category_name"),
+            cast(Document.structured_data, Text).label("structured_data_json")
+        ]
+        if mode == "snippet" and snippet_query:
+            columns.append(func.ts_headline(
+                "simple",
+                func.coalesce(Document.raw_text, ""),
+                func.plainto_tsquery("simple", snippet_query),
+                SNIPPET_HEADLINE_OPTIONS
+            ).label("snippet"))
+        stmt = select(*columns).outerjoin(
+            DocumentCategory, Document.category_id == DocumentCategory.id
+        ).where(
             Document.id == document_id,
             Document.user_id == user_uuid
-        ).first()
+        )
+        stmt = stmt.options(defer(Document.structured_data), defer(Document.search_tsv))
+        if mode == "snippet":
+            stmt = stmt.options(defer(Document.raw_text))
+        row = (await db.execute(stmt)).first()
         
-        if not document:
+        if not row:
             return ToolResponse(
                 success=False,
                 content=f"Document not found or access denied",
                 error="document_not_found"
             )
         
-        # Get category
-        category = db.query(DocumentCategory).filter(
-            DocumentCategory.id == document.category_id
-        ).first()
+        document, category_name, structured_data_json = row[0], row[1], row[2]
         
         doc_data = {
             "id": str(document.id),
             "title": document.title,
             "filename": document.original_filename,
             "summary": document.summary,
-            "content": document.raw_text,
-            "category": category.name if category else None,
-            "structured_data": document.structured_data or {},
+            "category": category_name,
+            "structured_data": _json_fragment(structured_data_json),
             "created_at": document.created_at.isoformat() if document.created_at else None,
             "processing_status": document.processing_status,
             "confidence_score": document.confidence_score
         }
         
-        # Debug logging
-        logger.info("Document retrieved successfully", 
-                   document_id=str(document.id),
-                   title=document.title,
-                   content_length=len(document.raw_text or ""),
-                   summary_length=len(document.summary or ""))
-        
-        # Give the agent complete raw text so it can find whatever it needs
         primary_content = f"Document: {document.title}\n\n"
         primary_content += f"Summary: {document.summary}\n\n"
-        primary_content += f"Full Document Content:\n{document.raw_text}"
         
-        return ToolResponse(
+        if mode == "full":
+            raw_text = document.raw_text or ""
+            primary_content += "Full Document Content:\n"
+            
+            # Large documents are streamed straight from raw_text instead of being
+            # copied into the content string and the response model
+            if len(raw_text) > STREAM_RAW_TEXT_THRESHOLD and request.parameters.get("stream", True):
+                logger.info("Streaming document", 
+                           document_id=str(document.id),
+                           content_length=len(raw_text))
+                return _stream_document_response(primary_content, raw_text, doc_data)
+            
+            # Give the agent complete raw text so it can find whatever it needs
+            doc_data["content"] = document.raw_text
+            primary_content += raw_text
+        else:
+            if structured_data_json and structured_data_json not in ("null", "{}"):
+                primary_content += f"Structured Data: {structured_data_json}\n\n"
+            if snippet_query:
+                doc_data["snippet"] = row.snippet
+                primary_content += f"Excerpts matching '{snippet_query}':\n{row.snippet}\n\n"
+            primary_content += "Call get_document with mode='full' for the complete document text."
+        
+        logger.info("Document retrieved successfully", 
+                   document_id=str(document.id),
+                   mode=mode)
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug("Document response size",
+                         title=document.title,
+                         content_length=len(primary_content),
+                         summary_length=len(document.summary or ""))
+        
+        return Response(content=orjson.dumps(ToolResponse(
             success=True,
             content=primary_content,
             metadata={"document": doc_data}
-        )
+        ).model_dump()), media_type="application/json")
         
     except Exception as e:
         logger.error("Get document failed", error=str(e), user_id=request.user_id)
@@ -293,62 +597,67 @@ async def get_user_document(request: ToolRequest, db: Session = Depends(get_db))
 
 
 @router.post("/travel_summary", response_model=ToolResponse)
-async def get_travel_summary(request: ToolRequest, db: Session = Depends(get_db)):
+async def get_travel_summary(request: ToolRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Get user's travel summary and statistics
     """
     try:
         # Get user with proper migration handling
-        from services.user_migration import UserMigrationService
         user_uuid = await UserMigrationService.get_accessible_user_id(request.user_id, db)
         if not user_uuid:
-            return ToolResponse(
-                success=False,
-                content="User authentication failed",
-                error="auth_failed"
-            )
-        
-        # Get document count by category
-        from sqlalchemy import func
-        category_stats = db.query(
-            DocumentCategory.name,
-            func.count(Document.id).label("count")
-        ).join(
-            Document, Document.category_id == DocumentCategory.id
-        ).filter(
-            Document.user_id == user_uuid
-        ).group_by(DocumentCategory.name).all()
-        
-        # Get total documents
-        total_docs = db.query(Document).filter(
-            Document.user_id == user_uuid
-        ).count()
-        
-        # Get recent documents
-        recent_docs = db.query(
+            return AUTH_FAILED_RESPONSE
+        
+        # Totals, per-category counts and recent documents in a single round-trip
+        user_documents = Document.user_id == user_uuid
+        # One scan of the user's documents feeds both the per-category counts and
+        # the total (uncategorized documents land in the NULL-name group)
+        category_counts = select(
+            DocumentCategory.name.label("name"),
+            func.count().label("count")
+        ).select_from(Document).outerjoin(
+            DocumentCategory, Document.category_id == DocumentCategory.id
+        ).where(user_documents).group_by(DocumentCategory.name).cte("category_counts")
+        recent_docs = select(
             Document.title,
-            Document.created_at,
-            DocumentCategory.name.label("category")
-        ).join(
-            DocumentCategory, Document.category_id == DocumentCategory.id, isouter=True
-        ).filter(
-            Document.user_id == user_uuid
-        ).order_by(Document.created_at.desc()).limit(5).all()
-        
-        # Format data
-        categories = [{"name": cat.name, "count": cat.count} for cat in category_stats]
-        recent = [
-            {
-                "title": doc.title,
-                "category": doc.category,
-                "uploaded": doc.created_at.isoformat() if doc.created_at else None
-            }
-            for doc in recent_docs
-        ]
+            DocumentCategory.name.label("category"),
+            Document.created_at
+        ).outerjoin(
+            DocumentCategory, Document.category_id == DocumentCategory.id
+        ).where(user_documents).order_by(Document.created_at.desc()).limit(5).subquery()
+        empty_json_array = literal_column("'[]'::json")
+        
+        stats = (await db.execute(select(
+            select(
+                cast(func.coalesce(func.sum(category_counts.c.count), 0), Integer)
+            ).scalar_subquery().label("total"),
+            select(func.coalesce(
+                func.json_agg(aggregate_order_by(
+                    func.json_build_object("name", category_counts.c.name, "count", category_counts.c.count),
+                    category_counts.c.count.desc(), category_counts.c.name
+                )).filter(category_counts.c.name.isnot(None)),
+                empty_json_array
+            )).scalar_subquery().label("categories"),
+            select(func.coalesce(
+                func.json_agg(aggregate_order_by(
+                    func.json_build_object(
+                        "title", recent_docs.c.title,
+                        "category", recent_docs.c.category,
+                        "uploaded", recent_docs.c.created_at
+                    ),
+                    recent_docs.c.created_at.desc()
+                )),
+                empty_json_array
+            )).scalar_subquery().label("recent")
+        ))).one()
+        
+        # Format data (categories arrive sorted by count, most common first)
+        total_docs = stats.total
+        categories = stats.categories
+        recent = stats.recent
         
         summary = f"You have {total_docs} travel documents across {len(categories)} categories."
         if categories:
-            most_common = max(categories, key=lambda x: x["count"])
+            most_common = categories[0]
             summary += f" Most documents are in '{most_common['name']}' category ({most_common['count']} documents)."
         
         return ToolResponse(
@@ -375,29 +684,28 @@ async def get_travel_summary(request: ToolRequest, db: Session = Depends(get_db)
 
 
 @router.post("/get_document_categories", response_model=ToolResponse)
-async def get_document_categories(request: ToolRequest, db: Session = Depends(get_db)):
+async def get_document_categories(request: ToolRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Get all available document categories to guide search strategy
     """
     try:
         # Get user with proper migration handling
-        from services.user_migration import UserMigrationService
         user_uuid = await UserMigrationService.get_accessible_user_id(request.user_id, db)
         if not user_uuid:
-            return ToolResponse(
-                success=False,
-                content="User authentication failed",
-                error="auth_failed"
-            )
+            return AUTH_FAILED_RESPONSE
+        
+        cached = get_cached_categories(user_uuid)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
         
         # Get categories with document counts for this user
-        from sqlalchemy import func
-        categories = db.query(
+        stmt = select(
             DocumentCategory.name,
             func.count(Document.id).label("count")
         ).outerjoin(
             Document, (Document.category_id == DocumentCategory.id) & (Document.user_id == user_uuid)
-        ).group_by(DocumentCategory.name).all()
+        ).group_by(DocumentCategory.name)
+        categories = (await db.execute(stmt)).all()
         
         # Format response
         category_list = []
@@ -408,11 +716,13 @@ async def get_document_categories(request: ToolRequest, db: Session = Depends(ge
         content = f"Available document categories:\n" + "\n".join([f"- {cat}" for cat in category_list])
         content += f"\n\nUse these categories to filter searches with category parameter."
         
-        return ToolResponse(
+        body = orjson.dumps(ToolResponse(
             success=True,
             content=content,
             metadata={"categories": [{"name": cat.name, "count": cat.count} for cat in categories]}
-        )
+        ).model_dump())
+        cache_categories(user_uuid, body)
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
         logger.error("Get categories failed", error=str(e), user_id=request.user_id)
@@ -424,20 +734,15 @@ async def get_document_categories(request: ToolRequest, db: Session = Depends(ge
 
 
 @router.post("/get_calendar_events", response_model=ToolResponse)
-async def get_user_calendar_events(request: ToolRequest, db: Session = Depends(get_db)):
+async def get_user_calendar_events(request: ToolRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Get user's calendar events for travel planning
     """
     try:
         # Get user with proper migration handling
-        from services.user_migration import UserMigrationService
         user_uuid = await UserMigrationService.get_accessible_user_id(request.user_id, db)
         if not user_uuid:
-            return ToolResponse(
-                success=False,
-                content="User authentication failed",
-                error="auth_failed"
-            )
+            return AUTH_FAILED_RESPONSE
         
         # Parse parameters
         start_date = request.parameters.get("start_date")
@@ -445,14 +750,24 @@ async def get_user_calendar_events(request: ToolRequest, db: Session = Depends(g
         event_type = request.parameters.get("event_type")
         limit = min(request.parameters.get("limit", 50), 100)  # Cap at 100
         
-        # Build query
-        query = db.query(CalendarEvent).filter(CalendarEvent.user_id == user_uuid)
+        # Build query (plain columns - the rows are only formatted, never modified)
+        stmt = select(
+            CalendarEvent.id,
+            CalendarEvent.title,
+            CalendarEvent.description,
+            CalendarEvent.location,
+            CalendarEvent.start_datetime,
+            CalendarEvent.end_datetime,
+            CalendarEvent.event_type,
+            CalendarEvent.status,
+            CalendarEvent.all_day
+        ).where(CalendarEvent.user_id == user_uuid)
         
         # Apply filters
         if start_date:
             try:
-                start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                query = query.filter(CalendarEvent.start_datetime >= start_dt)
+                start_dt = datetime.fromisoformat(start_date)
+                stmt = stmt.where(CalendarEvent.start_datetime >= start_dt)
             except ValueError:
                 return ToolResponse(
                     success=False,
@@ -462,8 +777,8 @@ async def get_user_calendar_events(request: ToolRequest, db: Session = Depends(g
         
         if end_date:
             try:
-                end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                query = query.filter(CalendarEvent.start_datetime <= end_dt)
+                end_dt = datetime.fromisoformat(end_date)
+                stmt = stmt.where(CalendarEvent.start_datetime <= end_dt)
             except ValueError:
                 return ToolResponse(
                     success=False,
@@ -472,10 +787,10 @@ async def get_user_calendar_events(request: ToolRequest, db: Session = Depends(g
                 )
         
         if event_type:
-            query = query.filter(CalendarEvent.event_type == event_type)
+            stmt = stmt.where(CalendarEvent.event_type == event_type)
         
         # Execute query
-        events = query.order_by(CalendarEvent.start_datetime).limit(limit).all()
+        events = (await db.execute(stmt.order_by(CalendarEvent.start_datetime).limit(limit))).all()
         
         # Format events for response
         event_list = []
@@ -541,20 +856,15 @@ async def get_user_calendar_events(request: ToolRequest, db: Session = Depends(g
 
 
 @router.post("/create_calendar_event", response_model=ToolResponse)
-async def create_user_calendar_event(request: ToolRequest, db: Session = Depends(get_db)):
+async def create_user_calendar_event(request: ToolRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new calendar event for the user
     """
     try:
         # Get user with proper migration handling
-        from services.user_migration import UserMigrationService
         user_uuid = await UserMigrationService.get_accessible_user_id(request.user_id, db)
         if not user_uuid:
-            return ToolResponse(
-                success=False,
-                content="User authentication failed",
-                error="auth_failed"
-            )
+            return AUTH_FAILED_RESPONSE
         
         # Extract required parameters
         title = request.parameters.get("title")
@@ -562,31 +872,22 @@ async def create_user_calendar_event(request: ToolRequest, db: Session = Depends
         event_type = request.parameters.get("event_type", "activity")
         
         if not title:
-            return ToolResponse(
-                success=False,
-                content="Event title is required",
-                error="missing_title"
-            )
+            return MISSING_TITLE_RESPONSE
         
         if not start_datetime:
-            return ToolResponse(
-                success=False,
-                content="Event start_datetime is required",
-                error="missing_start_datetime"
-            )
+            return MISSING_START_DATETIME_RESPONSE
         
         # Validate event type
-        valid_types = ["flight", "accommodation", "activity", "transport", "dining", "wellness"]
-        if event_type not in valid_types:
+        if event_type not in EVENT_TYPES:
             return ToolResponse(
                 success=False,
-                content=f"Invalid event_type '{event_type}'. Must be one of: {', '.join(valid_types)}",
+                content=f"Invalid event_type '{event_type}'. Must be one of: {', '.join(EVENT_COLORS)}",
                 error="invalid_event_type"
             )
         
         # Parse datetime
         try:
-            start_dt = datetime.fromisoformat(start_datetime.replace('Z', '+00:00'))
+            start_dt = datetime.fromisoformat(start_datetime)
         except ValueError:
             return ToolResponse(
                 success=False,
@@ -599,7 +900,7 @@ async def create_user_calendar_event(request: ToolRequest, db: Session = Depends
         end_datetime = request.parameters.get("end_datetime")
         if end_datetime:
             try:
-                end_dt = datetime.fromisoformat(end_datetime.replace('Z', '+00:00'))
+                end_dt = datetime.fromisoformat(end_datetime)
             except ValueError:
                 return ToolResponse(
                     success=False,
@@ -607,16 +908,6 @@ async def create_user_calendar_event(request: ToolRequest, db: Session = Depends
                     error="invalid_datetime_format"
                 )
         
-        # Set default color based on event type
-        color_map = {
-            "flight": "bg-blue-500",
-            "accommodation": "bg-green-500",
-            "activity": "bg-purple-500",
-            "transport": "bg-cyan-500",
-            "dining": "bg-yellow-500",
-            "wellness": "bg-pink-500"
-        }
-        
         # Create the event
         new_event = CalendarEvent(
             user_id=user_uuid,
@@ -627,18 +918,17 @@ async def create_user_calendar_event(request: ToolRequest, db: Session = Depends
             end_datetime=end_dt,
             all_day=request.parameters.get("all_day", False),
             event_type=event_type,
-            color=request.parameters.get("color", color_map.get(event_type, "bg-gray-500")),
+            color=request.parameters.get("color", EVENT_COLORS.get(event_type, DEFAULT_EVENT_COLOR)),
             status=request.parameters.get("status", "confirmed"),
             notes=request.parameters.get("notes"),
             source="agent_created"
         )
         
         db.add(new_event)
-        db.commit()
-        db.refresh(new_event)
+        await db.commit()
         
         # Format response
-        event_data = new_event.to_dict()
+        event_data = CalendarEventOut.model_validate(new_event).model_dump(mode="json")
         content = f"Calendar event '{title}' created successfully for {start_dt.strftime('%Y-%m-%d %H:%M')}"
         if new_event.location:
             content += f" at {new_event.location}"
@@ -666,28 +956,19 @@ async def create_user_calendar_event(request: ToolRequest, db: Session = Depends
 
 
 @router.post("/update_calendar_event", response_model=ToolResponse)
-async def update_user_calendar_event(request: ToolRequest, db: Session = Depends(get_db)):
+async def update_user_calendar_event(request: ToolRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Update an existing calendar event
     """
     try:
         # Get user with proper migration handling
-        from services.user_migration import UserMigrationService
         user_uuid = await UserMigrationService.get_accessible_user_id(request.user_id, db)
         if not user_uuid:
-            return ToolResponse(
-                success=False,
-                content="User authentication failed",
-                error="auth_failed"
-            )
+            return AUTH_FAILED_RESPONSE
         
         event_id = request.parameters.get("event_id")
         if not event_id:
-            return ToolResponse(
-                success=False,
-                content="Event ID is required",
-                error="missing_event_id"
-            )
+            return MISSING_EVENT_ID_RESPONSE
         
         # Parse event ID
         try:
@@ -700,10 +981,12 @@ async def update_user_calendar_event(request: ToolRequest, db: Session = Depends
             )
         
         # Get the event (user-scoped)
-        event = db.query(CalendarEvent).filter(
-            CalendarEvent.id == event_uuid,
-            CalendarEvent.user_id == user_uuid
-        ).first()
+        event = (await db.execute(
+            select(CalendarEvent).options(raiseload("*")).where(
+                CalendarEvent.id == event_uuid,
+                CalendarEvent.user_id == user_uuid
+            )
+        )).scalars().first()
         
         if not event:
             return ToolResponse(
@@ -714,14 +997,14 @@ async def update_user_calendar_event(request: ToolRequest, db: Session = Depends
         
         # Update fields if provided
         updates = {}
-        for field in ["title", "description", "location", "event_type", "status", "notes", "all_day"]:
+        for field in UPDATABLE_EVENT_FIELDS:
             if field in request.parameters:
                 updates[field] = request.parameters[field]
         
         # Handle datetime updates
         if "start_datetime" in request.parameters:
             try:
-                start_dt = datetime.fromisoformat(request.parameters["start_datetime"].replace('Z', '+00:00'))
+                start_dt = datetime.fromisoformat(request.parameters["start_datetime"])
                 updates["start_datetime"] = start_dt
             except ValueError:
                 return ToolResponse(
@@ -733,7 +1016,7 @@ async def update_user_calendar_event(request: ToolRequest, db: Session = Depends
         if "end_datetime" in request.parameters:
             if request.parameters["end_datetime"]:
                 try:
-                    end_dt = datetime.fromisoformat(request.parameters["end_datetime"].replace('Z', '+00:00'))
+                    end_dt = datetime.fromisoformat(request.parameters["end_datetime"])
                     updates["end_datetime"] = end_dt
                 except ValueError:
                     return ToolResponse(
@@ -748,11 +1031,10 @@ async def update_user_calendar_event(request: ToolRequest, db: Session = Depends
         for field, value in updates.items():
             setattr(event, field, value)
         
-        db.commit()
-        db.refresh(event)
+        await db.commit()
         
         # Format response
-        event_data = event.to_dict()
+        event_data = CalendarEventOut.model_validate(event).model_dump(mode="json")
         content = f"Calendar event '{event.title}' updated successfully. Event ID: {event_data['id']}"
         
         logger.info("Calendar event updated", 
@@ -776,28 +1058,19 @@ async def update_user_calendar_event(request: ToolRequest, db: Session = Depends
 
 
 @router.post("/delete_calendar_event", response_model=ToolResponse)
-async def delete_user_calendar_event(request: ToolRequest, db: Session = Depends(get_db)):
+async def delete_user_calendar_event(request: ToolRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Delete a calendar event
     """
     try:
         # Get user with proper migration handling
-        from services.user_migration import UserMigrationService
         user_uuid = await UserMigrationService.get_accessible_user_id(request.user_id, db)
         if not user_uuid:
-            return ToolResponse(
-                success=False,
-                content="User authentication failed",
-                error="auth_failed"
-            )
+            return AUTH_FAILED_RESPONSE
         
         event_id = request.parameters.get("event_id")
         if not event_id:
-            return ToolResponse(
-                success=False,
-                content="Event ID is required",
-                error="missing_event_id"
-            )
+            return MISSING_EVENT_ID_RESPONSE
         
         # Parse event ID
         try:
@@ -809,25 +1082,30 @@ async def delete_user_calendar_event(request: ToolRequest, db: Session = Depends
                 error="invalid_event_id"
             )
         
-        # Get the event (user-scoped)
-        event = db.query(CalendarEvent).filter(
-            CalendarEvent.id == event_uuid,
+        # Delete the event (user-scoped) in one round-trip. Events approved
+        # from this one lose their parent link first, as the ORM cascade did.
+        detach_children = update(CalendarEvent).where(
+            CalendarEvent.parent_event_id == event_uuid,
             CalendarEvent.user_id == user_uuid
-        ).first()
-        
-        if not event:
+        ).values(parent_event_id=None).returning(CalendarEvent.id).cte("detach_children")
+        row = (await db.execute(
+            delete(CalendarEvent).where(
+                CalendarEvent.id == event_uuid,
+                CalendarEvent.user_id == user_uuid
+            ).returning(CalendarEvent.title, CalendarEvent.id).add_cte(detach_children)
+        )).first()
+        
+        if row is None:
+            await db.rollback()
             return ToolResponse(
                 success=False,
                 content=f"Calendar event not found or access denied",
                 error="event_not_found"
             )
         
-        event_title = event.title
-        event_id_str = str(event.id)
-        
-        # Delete the event
-        db.delete(event)
-        db.commit()
+        await db.commit()
+        event_title = row.title
+        event_id_str = str(row.id)
         
         content = f"Calendar event '{event_title}' deleted successfully."
         
@@ -852,169 +1130,150 @@ async def delete_user_calendar_event(request: ToolRequest, db: Session = Depends
 
 
 @router.post("/suggest_calendar_event", response_model=ToolResponse)
-async def suggest_user_calendar_event(request: ToolRequest, db: Session = Depends(get_db)):
+async def suggest_user_calendar_event(request: ToolRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Suggest a new calendar event for the user's review and approval
     This creates a suggested event that appears in the chat carousel and calendar with special styling
     """
     try:
         # Get user with proper migration handling
-        from services.user_migration import UserMigrationService
         user_uuid = await UserMigrationService.get_accessible_user_id(request.user_id, db)
         if not user_uuid:
-            return ToolResponse(
-                success=False,
-                content="User authentication failed",
-                error="auth_failed"
-            )
+            return AUTH_FAILED_RESPONSE
         
-        # Extract required parameters
-        title = request.parameters.get("title")
-        start_datetime = request.parameters.get("start_datetime")
-        event_type = request.parameters.get("event_type", "activity")
-        suggestion_reason = request.parameters.get("suggestion_reason")
-        suggestion_confidence = request.parameters.get("suggestion_confidence", 7)
+        suggested_event, error_response = _build_suggested_event(request.parameters, user_uuid)
+        if error_response:
+            return error_response
         
-        if not title:
-            return ToolResponse(
-                success=False,
-                content="Event title is required",
-                error="missing_title"
-            )
+        db.add(suggested_event)
+        await db.commit()
         
-        if not start_datetime:
-            return ToolResponse(
-                success=False,
-                content="Event start_datetime is required",
-                error="missing_start_datetime"
-            )
-            
-        if not suggestion_reason:
-            return ToolResponse(
-                success=False,
-                content="Suggestion reason is required for suggested events",
-                error="missing_suggestion_reason"
-            )
+        # Format response
+        event_data = CalendarEventOut.model_validate(suggested_event).model_dump(mode="json")
+        content = f"I've suggested a calendar event '{suggested_event.title}' for {suggested_event.start_datetime.strftime('%Y-%m-%d %H:%M')}"
+        if suggested_event.location:
+            content += f" at {suggested_event.location}"
+        content += f". You can review and approve this suggestion in the chat interface or calendar view."
+        content += f"\n\nReason: {suggested_event.suggestion_reason}"
+        content += f"\nConfidence: {suggested_event.suggestion_confidence}/10"
         
-        # Validate event type
-        valid_types = ["flight", "accommodation", "activity", "transport", "dining", "wellness"]
-        if event_type not in valid_types:
+        logger.info("Calendar event suggested", 
+                   user_id=request.user_id,
+                   event_id=event_data["id"],
+                   title=suggested_event.title,
+                   event_type=suggested_event.event_type,
+                   confidence=suggested_event.suggestion_confidence)
+        
+        return ToolResponse(
+            success=True,
+            content=content,
+            metadata={"suggested_event": event_data}
+        )
+        
+    except Exception as e:
+        logger.error("Suggest calendar event failed", error=str(e), user_id=request.user_id)
+        return ToolResponse(
+            success=False,
+            content=f"Failed to suggest calendar event: {str(e)}",
+            error=str(e)
+        )
+
+
+@router.post("/suggest_calendar_events_bulk", response_model=ToolResponse)
+async def suggest_user_calendar_events_bulk(request: ToolRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Suggest several calendar events at once (e.g. a day plan)
+    All suggestions are validated first and inserted together in one statement
+    """
+    try:
+        # Get user with proper migration handling
+        user_uuid = await UserMigrationService.get_accessible_user_id(request.user_id, db)
+        if not user_uuid:
+            return AUTH_FAILED_RESPONSE
+        
+        events = request.parameters.get("events")
+        if not events or not isinstance(events, list):
             return ToolResponse(
                 success=False,
-                content=f"Invalid event_type '{event_type}'. Must be one of: {', '.join(valid_types)}",
-                error="invalid_event_type"
+                content="A non-empty list of events is required",
+                error="missing_events"
             )
         
-        # Validate confidence score
-        if not isinstance(suggestion_confidence, int) or not (1 <= suggestion_confidence <= 10):
+        if len(events) > SUGGEST_BULK_MAX:
             return ToolResponse(
                 success=False,
-                content="Suggestion confidence must be an integer between 1 and 10",
-                error="invalid_confidence"
+                content=f"Too many events: {len(events)}. Suggest at most {SUGGEST_BULK_MAX} per call",
+                error="too_many_events"
             )
         
-        # Parse datetime
-        try:
-            start_dt = datetime.fromisoformat(start_datetime.replace('Z', '+00:00'))
-        except ValueError:
+        # Validate everything before inserting anything
+        suggested_events = []
+        errors = []
+        for idx, parameters in enumerate(events, start=1):
+            if not isinstance(parameters, dict):
+                errors.append(f"Event {idx}: must be an object")
+                continue
+            suggested_event, error_response = _build_suggested_event(parameters, user_uuid)
+            if error_response:
+                errors.append(f"Event {idx}: {error_response.content}")
+            else:
+                suggested_events.append(suggested_event)
+        
+        if errors:
             return ToolResponse(
                 success=False,
-                content=f"Invalid start_datetime format: {start_datetime}. Use ISO format (YYYY-MM-DDTHH:MM:SS)",
-                error="invalid_datetime_format"
+                content="No events were suggested. Fix these and retry:\n" + "\n".join(errors),
+                error="invalid_events",
+                metadata={"errors": errors}
             )
         
-        # Parse end_datetime if provided
-        end_dt = None
-        end_datetime = request.parameters.get("end_datetime")
-        if end_datetime:
-            try:
-                end_dt = datetime.fromisoformat(end_datetime.replace('Z', '+00:00'))
-            except ValueError:
-                return ToolResponse(
-                    success=False,
-                    content=f"Invalid end_datetime format: {end_datetime}. Use ISO format (YYYY-MM-DDTHH:MM:SS)",
-                    error="invalid_datetime_format"
-                )
-        
-        # Set default color based on event type
-        color_map = {
-            "flight": "bg-blue-500",
-            "accommodation": "bg-green-500",
-            "activity": "bg-purple-500", 
-            "transport": "bg-cyan-500",
-            "dining": "bg-yellow-500",
-            "wellness": "bg-pink-500"
-        }
-        
-        # Create the suggested event
-        suggested_event = CalendarEvent(
-            user_id=user_uuid,
-            title=title,
-            description=request.parameters.get("description"),
-            location=request.parameters.get("location"),
-            start_datetime=start_dt,
-            end_datetime=end_dt,
-            all_day=request.parameters.get("all_day", False),
-            event_type=event_type,
-            color=request.parameters.get("color", color_map.get(event_type, "bg-gray-500")),
-            status="suggested",  # Always suggested for this endpoint
-            notes=request.parameters.get("notes"),
-            source="agent_suggested",
-            suggestion_reason=suggestion_reason,
-            suggestion_confidence=suggestion_confidence,
-            suggested_by="agent"
-        )
-        
-        db.add(suggested_event)
-        db.commit()
-        db.refresh(suggested_event)
+        # Flushed as a single multi-row INSERT ... RETURNING
+        db.add_all(suggested_events)
+        await db.commit()
         
         # Format response
-        event_data = suggested_event.to_dict()
-        content = f"I've suggested a calendar event '{title}' for {start_dt.strftime('%Y-%m-%d %H:%M')}"
-        if suggested_event.location:
-            content += f" at {suggested_event.location}"
-        content += f". You can review and approve this suggestion in the chat interface or calendar view."
-        content += f"\n\nReason: {suggestion_reason}"
-        content += f"\nConfidence: {suggestion_confidence}/10"
-        
-        logger.info("Calendar event suggested", 
+        events_data = CALENDAR_EVENT_LIST_ADAPTER.dump_python(
+            CALENDAR_EVENT_LIST_ADAPTER.validate_python(suggested_events, from_attributes=True),
+            mode="json"
+        )
+        content = f"I've suggested {len(suggested_events)} calendar events for your review:\n"
+        for event in suggested_events:
+            content += f"\n- {event.title} ({event.start_datetime.strftime('%Y-%m-%d %H:%M')})"
+            if event.location:
+                content += f" at {event.location}"
+            content += f" - {event.suggestion_reason} (confidence {event.suggestion_confidence}/10)"
+        content += "\n\nYou can review and approve these suggestions in the chat interface or calendar view."
+        
+        logger.info("Calendar events suggested", 
                    user_id=request.user_id,
-                   event_id=event_data["id"],
-                   title=title,
-                   event_type=event_type,
-                   confidence=suggestion_confidence)
+                   count=len(events_data),
+                   event_ids=[event["id"] for event in events_data])
         
         return ToolResponse(
             success=True,
             content=content,
-            metadata={"suggested_event": event_data}
+            metadata={"suggested_events": events_data}
         )
         
     except Exception as e:
-        logger.error("Suggest calendar event failed", error=str(e), user_id=request.user_id)
+        logger.error("Bulk suggest calendar events failed", error=str(e), user_id=request.user_id)
         return ToolResponse(
             success=False,
-            content=f"Failed to suggest calendar event: {str(e)}",
+            content=f"Failed to suggest calendar events: {str(e)}",
             error=str(e)
         )
 
 
 @router.post("/delete_calendar_events_bulk", response_model=ToolResponse)
-async def delete_user_calendar_events_bulk(request: ToolRequest, db: Session = Depends(get_db)):
+async def delete_user_calendar_events_bulk(request: ToolRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Delete multiple calendar events based on filters (date range, event type, etc.)
     """
     try:
         # Get user with proper migration handling
-        from services.user_migration import UserMigrationService
         user_uuid = await UserMigrationService.get_accessible_user_id(request.user_id, db)
         if not user_uuid:
-            return ToolResponse(
-                success=False,
-                content="User authentication failed",
-                error="auth_failed"
-            )
+            return AUTH_FAILED_RESPONSE
         
         # Parse parameters
         start_date = request.parameters.get("start_date")
@@ -1024,14 +1283,14 @@ async def delete_user_calendar_events_bulk(request: ToolRequest, db: Session = D
         event_ids = request.parameters.get("event_ids", [])  # List of specific event IDs
         
         # Build query for user's events only
-        query = db.query(CalendarEvent).filter(CalendarEvent.user_id == user_uuid)
+        stmt = select(CalendarEvent).options(raiseload("*")).where(CalendarEvent.user_id == user_uuid)
         
         # Apply filters
         if start_date:
             try:
-                start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+                start_dt = datetime.fromisoformat(start_date)
                 # For date-only filtering, check if event starts on or after the start date
-                query = query.filter(CalendarEvent.start_datetime >= start_dt)
+                stmt = stmt.where(CalendarEvent.start_datetime >= start_dt)
             except ValueError:
                 return ToolResponse(
                     success=False,
@@ -1041,12 +1300,11 @@ async def delete_user_calendar_events_bulk(request: ToolRequest, db: Session = D
         
         if end_date:
             try:
-                end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+                end_dt = datetime.fromisoformat(end_date)
                 # For end date, include events that start before the end of the day
                 if 'T' not in end_date:  # If only date provided, add end of day
-                    from datetime import timedelta
                     end_dt = end_dt.replace(hour=23, minute=59, second=59)
-                query = query.filter(CalendarEvent.start_datetime <= end_dt)
+                stmt = stmt.where(CalendarEvent.start_datetime <= end_dt)
             except ValueError:
                 return ToolResponse(
                     success=False,
@@ -1055,16 +1313,16 @@ async def delete_user_calendar_events_bulk(request: ToolRequest, db: Session = D
                 )
         
         if event_type:
-            query = query.filter(CalendarEvent.event_type == event_type)
+            stmt = stmt.where(CalendarEvent.event_type == event_type)
         
         if status:
-            query = query.filter(CalendarEvent.status == status)
+            stmt = stmt.where(CalendarEvent.status == status)
         
         if event_ids:
             # If specific event IDs provided, filter by those
             try:
                 event_uuids = [uuid.UUID(eid) for eid in event_ids]
-                query = query.filter(CalendarEvent.id.in_(event_uuids))
+                stmt = stmt.where(CalendarEvent.id.in_(event_uuids))
             except ValueError as e:
                 return ToolResponse(
                     success=False,
@@ -1073,7 +1331,7 @@ async def delete_user_calendar_events_bulk(request: ToolRequest, db: Session = D
                 )
         
         # Get events to be deleted (for logging and response)
-        events_to_delete = query.all()
+        events_to_delete = (await db.execute(stmt)).scalars().all()
         
         if not events_to_delete:
             filter_desc = []
@@ -1110,8 +1368,14 @@ async def delete_user_calendar_events_bulk(request: ToolRequest, db: Session = D
             })
         
         # Delete the events
-        delete_count = query.delete(synchronize_session=False)
-        db.commit()
+        result = await db.execute(
+            delete(CalendarEvent).where(
+                CalendarEvent.user_id == user_uuid,
+                CalendarEvent.id.in_([event.id for event in events_to_delete])
+            ).execution_options(synchronize_session=False)
+        )
+        delete_count = result.rowcount
+        await db.commit()
         
         # Create response content
         filter_desc = []
@@ -1169,27 +1433,30 @@ async def delete_user_calendar_events_bulk(request: ToolRequest, db: Session = D
 
 
 @router.post("/show_suggested_events_carousel", response_model=ToolResponse)
-async def show_suggested_events_carousel(request: ToolRequest, db: Session = Depends(get_db)):
+async def show_suggested_events_carousel(request: ToolRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Signal the frontend to show the suggested events carousel
     Use this after creating event suggestions to prompt user for approval
     """
     try:
         # Get user with proper migration handling
-        from services.user_migration import UserMigrationService
         user_uuid = await UserMigrationService.get_accessible_user_id(request.user_id, db)
         if not user_uuid:
-            return ToolResponse(
-                success=False,
-                content="User authentication failed",
-                error="auth_failed"
-            )
+            return AUTH_FAILED_RESPONSE
+        
+        # Right after suggesting, the agent already knows what it created; the
+        # carousel loads the events itself, so the count query can be skipped
+        if request.parameters.get("skip_count", False):
+            logger.info("Showing suggested events carousel", user_id=request.user_id)
+            return CAROUSEL_SKIP_COUNT_RESPONSE
         
         # Get current suggested events count
-        suggested_count = db.query(CalendarEvent).filter(
-            CalendarEvent.user_id == user_uuid,
-            CalendarEvent.status == "suggested"
-        ).count()
+        suggested_count = await db.scalar(
+            select(func.count()).select_from(CalendarEvent).where(
+                CalendarEvent.user_id == user_uuid,
+                CalendarEvent.status == "suggested"
+            )
+        )
         
         content = f"Showing suggested events carousel with {suggested_count} suggestions for your review."
         if suggested_count == 0:
@@ -1217,297 +1484,367 @@ async def show_suggested_events_carousel(request: ToolRequest, db: Session = Dep
         )
 
 
-@router.get("/available_tools", response_model=List[Dict[str, Any]])
-async def get_available_tools():
-    """
-    Get list of available KohTravel-specific tools for the agent
-    """
-    tools = [
-        {
-            "name": "search_documents",
-            "description": "Search through user's uploaded travel documents by content or title",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Search query for document content"
-                    },
-                    "category": {
-                        "type": "string",
-                        "description": "Filter by document category (optional)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of documents to return",
-                        "default": 10
-                    }
-                },
-                "required": ["query"]
-            }
+# Parameters of one suggested event (suggest_calendar_event, and each item of
+# suggest_calendar_events_bulk)
+SUGGESTED_EVENT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "title": {
+            "type": "string",
+            "description": "Event title"
         },
-        {
-            "name": "get_document",
-            "description": "Get detailed information about a specific document by ID",
-            "parameters": {
-                "type": "object", 
-                "properties": {
-                    "document_id": {
-                        "type": "string",
-                        "description": "ID of the document to retrieve"
-                    }
-                },
-                "required": ["document_id"]
-            }
+        "start_datetime": {
+            "type": "string",
+            "description": "Event start date and time (ISO format: YYYY-MM-DDTHH:MM:SS)"
         },
-        {
-            "name": "travel_summary",
-            "description": "Get user's travel document summary and statistics",
-            "parameters": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+        "end_datetime": {
+            "type": "string",
+            "description": "Event end date and time (optional, ISO format: YYYY-MM-DDTHH:MM:SS)"
         },
-        {
-            "name": "get_document_categories",
-            "description": "Get all available document categories to understand what types of documents exist",
-            "parameters": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+        "event_type": {
+            "type": "string",
+            "description": "Event type: flight, accommodation, activity, transport, dining, wellness (default: activity)"
         },
-        {
-            "name": "get_calendar_events",
-            "description": "Get user's calendar events for travel planning, with optional date and type filtering",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "start_date": {
-                        "type": "string",
-                        "description": "Filter events from this date (ISO format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)"
-                    },
-                    "end_date": {
-                        "type": "string",
-                        "description": "Filter events until this date (ISO format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)"
-                    },
-                    "event_type": {
-                        "type": "string",
-                        "description": "Filter by event type: flight, accommodation, activity, transport, dining, wellness"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of events to return (default: 50, max: 100)"
-                    }
-                },
-                "required": []
-            }
+        "description": {
+            "type": "string",
+            "description": "Event description (optional)"
         },
-        {
-            "name": "create_calendar_event",
-            "description": "Create a new calendar event for travel planning",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "title": {
-                        "type": "string",
-                        "description": "Event title"
-                    },
-                    "start_datetime": {
-                        "type": "string",
-                        "description": "Event start date and time (ISO format: YYYY-MM-DDTHH:MM:SS)"
-                    },
-                    "end_datetime": {
-                        "type": "string",
-                        "description": "Event end date and time (optional, ISO format: YYYY-MM-DDTHH:MM:SS)"
-                    },
-                    "event_type": {
-                        "type": "string",
-                        "description": "Event type: flight, accommodation, activity, transport, dining, wellness (default: activity)"
-                    },
-                    "description": {
-                        "type": "string",
-                        "description": "Event description (optional)"
-                    },
-                    "location": {
-                        "type": "string",
-                        "description": "Event location (optional)"
-                    },
-                    "all_day": {
-                        "type": "boolean",
-                        "description": "Whether this is an all-day event (default: false)"
-                    },
-                    "status": {
-                        "type": "string",
-                        "description": "Event status: confirmed, tentative, cancelled (default: confirmed)"
-                    },
-                    "notes": {
-                        "type": "string",
-                        "description": "Additional notes (optional)"
-                    }
-                },
-                "required": ["title", "start_datetime"]
-            }
+        "location": {
+            "type": "string",
+            "description": "Event location (optional)"
         },
-        {
-            "name": "update_calendar_event",
-            "description": "Update an existing calendar event",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "event_id": {
-                        "type": "string",
-                        "description": "ID of the event to update"
-                    },
-                    "title": {
-                        "type": "string",
-                        "description": "Event title (optional)"
-                    },
-                    "start_datetime": {
-                        "type": "string",
-                        "description": "Event start date and time (optional, ISO format: YYYY-MM-DDTHH:MM:SS)"
-                    },
-                    "end_datetime": {
-                        "type": "string",
-                        "description": "Event end date and time (optional, ISO format: YYYY-MM-DDTHH:MM:SS)"
-                    },
-                    "event_type": {
-                        "type": "string",
-                        "description": "Event type: flight, accommodation, activity, transport, dining, wellness (optional)"
-                    },
-                    "description": {
-                        "type": "string",
-                        "description": "Event description (optional)"
-                    },
-                    "location": {
-                        "type": "string",
-                        "description": "Event location (optional)"
-                    },
-                    "all_day": {
-                        "type": "boolean",
-                        "description": "Whether this is an all-day event (optional)"
-                    },
-                    "status": {
-                        "type": "string",
-                        "description": "Event status: confirmed, tentative, cancelled (optional)"
-                    },
-                    "notes": {
-                        "type": "string",
-                        "description": "Additional notes (optional)"
-                    }
-                },
-                "required": ["event_id"]
-            }
+        "all_day": {
+            "type": "boolean",
+            "description": "Whether this is an all-day event (default: false)"
         },
-        {
-            "name": "delete_calendar_event",
-            "description": "Delete a calendar event",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "event_id": {
-                        "type": "string",
-                        "description": "ID of the event to delete"
-                    }
-                },
-                "required": ["event_id"]
-            }
+        "notes": {
+            "type": "string",
+            "description": "Additional notes (optional)"
         },
-        {
-            "name": "delete_calendar_events_bulk",
-            "description": "Delete multiple calendar events based on filters like date range, event type, or status. Perfect for requests like 'delete all events from tomorrow' or 'delete all activities this week'.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "start_date": {
-                        "type": "string",
-                        "description": "Delete events from this date onwards (ISO format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)"
-                    },
-                    "end_date": {
-                        "type": "string", 
-                        "description": "Delete events until this date (ISO format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)"
-                    },
-                    "event_type": {
-                        "type": "string",
-                        "description": "Delete only events of this type: flight, accommodation, activity, transport, dining, wellness"
-                    },
-                    "status": {
-                        "type": "string",
-                        "description": "Delete only events with this status: confirmed, tentative, cancelled, suggested"
-                    },
-                    "event_ids": {
-                        "type": "array",
-                        "items": {
-                            "type": "string"
-                        },
-                        "description": "Delete specific events by their IDs (optional)"
-                    }
-                },
-                "required": []
-            }
+        "suggestion_reason": {
+            "type": "string",
+            "description": "Required: Explain why you're suggesting this event to help the user understand the recommendation"
         },
-        {
-            "name": "suggest_calendar_event",
-            "description": "Suggest a new calendar event that appears in the chat carousel for user approval. Use this when you want to propose events based on user documents or conversation context.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "title": {
-                        "type": "string",
-                        "description": "Event title"
-                    },
-                    "start_datetime": {
-                        "type": "string",
-                        "description": "Event start date and time (ISO format: YYYY-MM-DDTHH:MM:SS)"
-                    },
-                    "end_datetime": {
-                        "type": "string",
-                        "description": "Event end date and time (optional, ISO format: YYYY-MM-DDTHH:MM:SS)"
-                    },
-                    "event_type": {
-                        "type": "string",
-                        "description": "Event type: flight, accommodation, activity, transport, dining, wellness (default: activity)"
-                    },
-                    "description": {
-                        "type": "string",
-                        "description": "Event description (optional)"
-                    },
-                    "location": {
-                        "type": "string",
-                        "description": "Event location (optional)"
-                    },
-                    "all_day": {
-                        "type": "boolean",
-                        "description": "Whether this is an all-day event (default: false)"
-                    },
-                    "notes": {
-                        "type": "string",
-                        "description": "Additional notes (optional)"
-                    },
-                    "suggestion_reason": {
-                        "type": "string",
-                        "description": "Required: Explain why you're suggesting this event to help the user understand the recommendation"
-                    },
-                    "suggestion_confidence": {
-                        "type": "integer",
-                        "description": "Confidence level from 1-10 for this suggestion (default: 7)"
-                    }
+        "suggestion_confidence": {
+            "type": "integer",
+            "description": "Confidence level from 1-10 for this suggestion (default: 7)"
+        }
+    },
+    "required": ["title", "start_datetime", "suggestion_reason"]
+}
+
+# Tool definitions served to the agent infrastructure. The list is static, so
+# it is serialized once at import time.
+AVAILABLE_TOOLS: List[Dict[str, Any]] = [
+    {
+        "name": "search_documents",
+        "description": "Search through user's uploaded travel documents by content or title",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query for document content"
                 },
-                "required": ["title", "start_datetime", "suggestion_reason"]
-            }
-        },
-        {
-            "name": "show_suggested_events_carousel",
-            "description": "Display the suggested events carousel in the chat interface. Use this after creating event suggestions to prompt the user for approval/rejection.",
-            "parameters": {
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
+                "category": {
+                    "type": "string",
+                    "description": "Filter by document category (optional)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of documents to return",
+                    "default": 10
+                }
+            },
+            "required": ["query"]
         }
-    ]
-    
-    return tools
+    },
+    {
+        "name": "search_and_fetch",
+        "description": "Search documents and get the best match's full content in one step (up to 3 matches, the others with matching excerpts)",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query to find relevant documents"
+                },
+                "category": {
+                    "type": "string",
+                    "description": "Filter by document category (optional)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of documents to return (default 3, max 3)",
+                    "default": 3
+                }
+            },
+            "required": ["query"]
+        }
+    },
+    {
+        "name": "get_document",
+        "description": "Get detailed information about a specific document by ID",
+        "parameters": {
+            "type": "object", 
+            "properties": {
+                "document_id": {
+                    "type": "string",
+                    "description": "ID of the document to retrieve"
+                },
+                "mode": {
+                    "type": "string",
+                    "enum": ["snippet", "full"],
+                    "description": "'snippet' (default) returns summary, structured data and matching excerpts; 'full' returns the complete document text"
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Words to pull matching excerpts for in snippet mode (optional)"
+                },
+                "stream": {
+                    "type": "boolean",
+                    "description": "Stream very large documents in full mode (default true)",
+                    "default": True
+                }
+            },
+            "required": ["document_id"]
+        }
+    },
+    {
+        "name": "travel_summary",
+        "description": "Get user's travel document summary and statistics",
+        "parameters": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    },
+    {
+        "name": "get_document_categories",
+        "description": "Get all available document categories to understand what types of documents exist",
+        "parameters": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    },
+    {
+        "name": "get_calendar_events",
+        "description": "Get user's calendar events for travel planning, with optional date and type filtering",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "start_date": {
+                    "type": "string",
+                    "description": "Filter events from this date (ISO format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)"
+                },
+                "end_date": {
+                    "type": "string",
+                    "description": "Filter events until this date (ISO format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)"
+                },
+                "event_type": {
+                    "type": "string",
+                    "description": "Filter by event type: flight, accommodation, activity, transport, dining, wellness"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of events to return (default: 50, max: 100)"
+                }
+            },
+            "required": []
+        }
+    },
+    {
+        "name": "create_calendar_event",
+        "description": "Create a new calendar event for travel planning",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "title": {
+                    "type": "string",
+                    "description": "Event title"
+                },
+                "start_datetime": {
+                    "type": "string",
+                    "description": "Event start date and time (ISO format: YYYY-MM-DDTHH:MM:SS)"
+                },
+                "end_datetime": {
+                    "type": "string",
+                    "description": "Event end date and time (optional, ISO format: YYYY-MM-DDTHH:MM:SS)"
+                },
+                "event_type": {
+                    "type": "string",
+                    "description": "Event type: flight, accommodation, activity, transport, dining, wellness (default: activity)"
+                },
+                "description": {
+                    "type": "string",
+                    "description": "Event description (optional)"
+                },
+                "location": {
+                    "type": "string",
+                    "description": "Event location (optional)"
+                },
+                "all_day": {
+                    "type": "boolean",
+                    "description": "Whether this is an all-day event (default: false)"
+                },
+                "status": {
+                    "type": "string",
+                    "description": "Event status: confirmed, tentative, cancelled (default: confirmed)"
+                },
+                "notes": {
+                    "type": "string",
+                    "description": "Additional notes (optional)"
+                }
+            },
+            "required": ["title", "start_datetime"]
+        }
+    },
+    {
+        "name": "update_calendar_event",
+        "description": "Update an existing calendar event",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "event_id": {
+                    "type": "string",
+                    "description": "ID of the event to update"
+                },
+                "title": {
+                    "type": "string",
+                    "description": "Event title (optional)"
+                },
+                "start_datetime": {
+                    "type": "string",
+                    "description": "Event start date and time (optional, ISO format: YYYY-MM-DDTHH:MM:SS)"
+                },
+                "end_datetime": {
+                    "type": "string",
+                    "description": "Event end date and time (optional, ISO format: YYYY-MM-DDTHH:MM:SS)"
+                },
+                "event_type": {
+                    "type": "string",
+                    "description": "Event type: flight, accommodation, activity, transport, dining, wellness (optional)"
+                },
+                "description": {
+                    "type": "string",
+                    "description": "Event description (optional)"
+                },
+                "location": {
+                    "type": "string",
+                    "description": "Event location (optional)"
+                },
+                "all_day": {
+                    "type": "boolean",
+                    "description": "Whether this is an all-day event (optional)"
+                },
+                "status": {
+                    "type": "string",
+                    "description": "Event status: confirmed, tentative, cancelled (optional)"
+                },
+                "notes": {
+                    "type": "string",
+                    "description": "Additional notes (optional)"
+                }
+            },
+            "required": ["event_id"]
+        }
+    },
+    {
+        "name": "delete_calendar_event",
+        "description": "Delete a calendar event",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "event_id": {
+                    "type": "string",
+                    "description": "ID of the event to delete"
+                }
+            },
+            "required": ["event_id"]
+        }
+    },
+    {
+        "name": "delete_calendar_events_bulk",
+        "description": "Delete multiple calendar events based on filters like date range, event type, or status. Perfect for requests like 'delete all events from tomorrow' or 'delete all activities this week'.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "start_date": {
+                    "type": "string",
+                    "description": "Delete events from this date onwards (ISO format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)"
+                },
+                "end_date": {
+                    "type": "string", 
+                    "description": "Delete events until this date (ISO format: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)"
+                },
+                "event_type": {
+                    "type": "string",
+                    "description": "Delete only events of this type: flight, accommodation, activity, transport, dining, wellness"
+                },
+                "status": {
+                    "type": "string",
+                    "description": "Delete only events with this status: confirmed, tentative, cancelled, suggested"
+                },
+                "event_ids": {
+                    "type": "array",
+                    "items": {
+                        "type": "string"
+                    },
+                    "description": "Delete specific events by their IDs (optional)"
+                }
+            },
+            "required": []
+        }
+    },
+    {
+        "name": "suggest_calendar_event",
+        "description": "Suggest a new calendar event that appears in the chat carousel for user approval. Use this when you want to propose events based on user documents or conversation context.",
+        "parameters": SUGGESTED_EVENT_SCHEMA
+    },
+    {
+        "name": "suggest_calendar_events_bulk",
+        "description": f"Suggest several calendar events at once (up to {SUGGEST_BULK_MAX}), e.g. a full day plan. Each event takes the same fields as suggest_calendar_event; all are validated before any is saved.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "events": {
+                    "type": "array",
+                    "description": "Events to suggest",
+                    "items": SUGGESTED_EVENT_SCHEMA
+                }
+            },
+            "required": ["events"]
+        }
+    },
+    {
+        "name": "show_suggested_events_carousel",
+        "description": "Display the suggested events carousel in the chat interface. Use this after creating event suggestions to prompt the user for approval/rejection.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "skip_count": {
+                    "type": "boolean",
+                    "description": "Skip counting pending suggestions, e.g. right after you created them (default: false)"
+                }
+            },
+            "required": []
+        }
+    }
+]
+AVAILABLE_TOOLS_JSON = orjson.dumps(AVAILABLE_TOOLS)
+AVAILABLE_TOOLS_CACHE_CONTROL = "public, max-age=300"
+
+
+@router.get("/available_tools")
+async def get_available_tools():
+    """
+    Get list of available KohTravel-specific tools for the agent
+    """
+    return Response(
+        content=AVAILABLE_TOOLS_JSON,
+        media_type="application/json",
+        headers={"Cache-Control": AVAILABLE_TOOLS_CACHE_CONTROL}
+    )
 
 
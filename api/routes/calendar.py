@@ -1,17 +1,47 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-from typing import List, Optional
-from datetime import datetime, date, timedelta
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from sqlalchemy import and_, or_, func, insert, literal, select, update
+from typing import List, Literal, Optional, get_args
+from datetime import datetime, date, time, timedelta
+import hashlib
+import orjson
 import uuid
 
-from database import get_db
-from models.calendar_event import CalendarEvent
-from models.user import User
+from database import get_async_db
+from models.calendar_event import CalendarEvent, CalendarEventOut, EVENT_COLORS, DEFAULT_EVENT_COLOR
+from models.user import AuthenticatedUser
 from services.auth import get_current_user
 from pydantic import BaseModel, Field
 
+# Accepted event_type and status values, validated as literals by pydantic-core
+EventType = Literal["flight", "accommodation", "activity", "transport", "dining", "wellness"]
+assert set(get_args(EventType)) == set(EVENT_COLORS), "EventType is out of sync with EVENT_COLORS"
+EventStatus = Literal["confirmed", "tentative", "cancelled", "suggested"]
+
+# end_date filters are inclusive: events must start before the following midnight
+ONE_DAY = timedelta(days=1)
+
+# Suggestion fields copied onto the confirmed event when a suggestion is approved
+APPROVED_EVENT_FIELDS = (
+    "title", "description", "location", "start_datetime", "end_datetime",
+    "all_day", "event_type", "color", "notes", "document_id"
+)
+
+# GET /event-types payload, built once from the model's event colors
+EVENT_TYPE_OPTIONS = {
+    "event_types": [
+        {"type": event_type, "label": event_type.capitalize(), "color": color}
+        for event_type, color in EVENT_COLORS.items()
+    ]
+}
+EVENT_TYPE_OPTIONS_JSON = orjson.dumps(EVENT_TYPE_OPTIONS)
+EVENT_TYPE_OPTIONS_HEADERS = {
+    "ETag": f'"{hashlib.sha256(EVENT_TYPE_OPTIONS_JSON).hexdigest()[:32]}"',
+    "Cache-Control": "public, max-age=86400"
+}
+
 # Pydantic models for request/response
 class CalendarEventCreate(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
@@ -20,11 +50,11 @@ class CalendarEventCreate(BaseModel):
     start_datetime: datetime
     end_datetime: Optional[datetime] = None
     all_day: bool = False
-    event_type: str = Field(..., pattern="^(flight|accommodation|activity|transport|dining|wellness)$")
+    event_type: EventType
     color: Optional[str] = None
-    status: str = Field(default="confirmed", pattern="^(confirmed|tentative|cancelled|suggested)$")
+    status: EventStatus = "confirmed"
     notes: Optional[str] = None
-    document_id: Optional[str] = None
+    document_id: Optional[uuid.UUID] = None
     suggestion_reason: Optional[str] = None
     suggestion_confidence: Optional[int] = Field(None, ge=1, le=10)
     suggested_by: Optional[str] = None
@@ -36,9 +66,9 @@ class CalendarEventUpdate(BaseModel):
     start_datetime: Optional[datetime] = None
     end_datetime: Optional[datetime] = None
     all_day: Optional[bool] = None
-    event_type: Optional[str] = Field(None, pattern="^(flight|accommodation|activity|transport|dining|wellness)$")
+    event_type: Optional[EventType] = None
     color: Optional[str] = None
-    status: Optional[str] = Field(None, pattern="^(confirmed|tentative|cancelled|suggested)$")
+    status: Optional[EventStatus] = None
     notes: Optional[str] = None
 
 class SuggestedEventCreate(BaseModel):
@@ -48,10 +78,10 @@ class SuggestedEventCreate(BaseModel):
     start_datetime: datetime
     end_datetime: Optional[datetime] = None
     all_day: bool = False
-    event_type: str = Field(..., pattern="^(flight|accommodation|activity|transport|dining|wellness)$")
+    event_type: EventType
     color: Optional[str] = None
     notes: Optional[str] = None
-    document_id: Optional[str] = None
+    document_id: Optional[uuid.UUID] = None
     suggestion_reason: str = Field(..., min_length=1)
     suggestion_confidence: int = Field(..., ge=1, le=10)
     suggested_by: str = Field(default="agent")
@@ -60,71 +90,49 @@ class EventApprovalRequest(BaseModel):
     approved: bool
     user_feedback: Optional[str] = None
 
-class CalendarEventResponse(BaseModel):
-    id: str
-    title: str
-    description: Optional[str]
-    location: Optional[str]
-    start_datetime: datetime
-    end_datetime: Optional[datetime]
-    all_day: bool
-    event_type: str
-    color: Optional[str]
-    status: str
-    notes: Optional[str]
-    source: str
-    document_id: Optional[str]
-    suggestion_reason: Optional[str]
-    suggestion_confidence: Optional[int]
-    user_feedback: Optional[str]
-    suggested_by: Optional[str]
-    parent_event_id: Optional[str]
-    created_at: datetime
-    updated_at: datetime
-
 router = APIRouter(
     prefix="/api/calendar",
     tags=["calendar"]
 )
 
-@router.get("/events", response_model=List[CalendarEventResponse])
+@router.get("/events", response_model=List[CalendarEventOut])
 async def get_events(
     start_date: Optional[date] = Query(None, description="Filter events from this date"),
     end_date: Optional[date] = Query(None, description="Filter events until this date"),
     event_type: Optional[str] = Query(None, description="Filter by event type"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Get calendar events for the authenticated user"""
     
-    query = db.query(CalendarEvent).filter(CalendarEvent.user_id == current_user.id)
+    query = select(CalendarEvent).options(raiseload("*")).where(CalendarEvent.user_id == current_user.id)
     
     # Apply date filters if provided
     if start_date:
-        query = query.filter(CalendarEvent.start_datetime >= start_date)
+        query = query.where(CalendarEvent.start_datetime >= start_date)
     if end_date:
         # Add one day to include events on the end_date
-        end_datetime = datetime.combine(end_date, datetime.min.time()) + timedelta(days=1)
-        query = query.filter(CalendarEvent.start_datetime < end_datetime)
+        end_datetime = datetime.combine(end_date, time.min) + ONE_DAY
+        query = query.where(CalendarEvent.start_datetime < end_datetime)
     
     # Apply event type filter if provided
     if event_type:
-        query = query.filter(CalendarEvent.event_type == event_type)
+        query = query.where(CalendarEvent.event_type == event_type)
     
     # Order by start datetime
-    events = query.order_by(CalendarEvent.start_datetime).all()
+    events = (await db.execute(query.order_by(CalendarEvent.start_datetime))).scalars().all()
     
-    return [CalendarEventResponse(**event.to_dict()) for event in events]
+    return events
 
-@router.get("/events/suggested", response_model=List[CalendarEventResponse])
+@router.get("/events/suggested", response_model=List[CalendarEventOut])
 async def get_suggested_events(
     limit: Optional[int] = Query(None, description="Limit number of suggestions returned"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Get all pending suggested events for the authenticated user"""
     
-    query = db.query(CalendarEvent).filter(
+    query = select(CalendarEvent).options(raiseload("*")).where(
         CalendarEvent.user_id == current_user.id,
         CalendarEvent.status == "suggested"
     ).order_by(CalendarEvent.start_datetime)
@@ -132,60 +140,40 @@ async def get_suggested_events(
     if limit:
         query = query.limit(limit)
     
-    events = query.all()
-    return [CalendarEventResponse(**event.to_dict()) for event in events]
+    events = (await db.execute(query)).scalars().all()
+    return events
 
-@router.get("/events/{event_id}", response_model=CalendarEventResponse)
+@router.get("/events/{event_id}", response_model=CalendarEventOut)
 async def get_event(
-    event_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    event_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Get a specific calendar event"""
     
-    try:
-        event_uuid = uuid.UUID(event_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid event ID format")
-    
-    event = db.query(CalendarEvent).filter(
-        CalendarEvent.id == event_uuid,
-        CalendarEvent.user_id == current_user.id
-    ).first()
+    event = (await db.execute(
+        select(CalendarEvent).options(raiseload("*")).where(
+            CalendarEvent.id == event_id,
+            CalendarEvent.user_id == current_user.id
+        )
+    )).scalars().first()
     
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    return CalendarEventResponse(**event.to_dict())
+    return event
 
-@router.post("/events", response_model=CalendarEventResponse)
+@router.post("/events", response_model=CalendarEventOut)
 async def create_event(
     event_data: CalendarEventCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Create a new calendar event"""
     
-    # Validate document_id if provided
-    document_uuid = None
-    if event_data.document_id:
-        try:
-            document_uuid = uuid.UUID(event_data.document_id)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid document ID format")
-    
     # Set default color based on event type if not provided
-    color_map = {
-        "flight": "bg-blue-500",
-        "accommodation": "bg-green-500",
-        "activity": "bg-purple-500",
-        "transport": "bg-cyan-500",
-        "dining": "bg-yellow-500",
-        "wellness": "bg-pink-500"
-    }
-    
     if not event_data.color:
-        event_data.color = color_map.get(event_data.event_type, "bg-gray-500")
+        event_data.color = EVENT_COLORS.get(event_data.event_type, DEFAULT_EVENT_COLOR)
     
     # Create the event
     event = CalendarEvent(
@@ -200,7 +188,7 @@ async def create_event(
         color=event_data.color,
         status=event_data.status,
         notes=event_data.notes,
-        document_id=document_uuid,
+        document_id=event_data.document_id,
         source="manual",
         suggestion_reason=getattr(event_data, 'suggestion_reason', None),
         suggestion_confidence=getattr(event_data, 'suggestion_confidence', None),
@@ -208,109 +196,101 @@ async def create_event(
     )
     
     db.add(event)
-    db.commit()
-    db.refresh(event)
+    await db.commit()
     
-    return CalendarEventResponse(**event.to_dict())
+    return event
 
-@router.put("/events/{event_id}", response_model=CalendarEventResponse)
+@router.put("/events/{event_id}", response_model=CalendarEventOut)
 async def update_event(
-    event_id: str,
+    event_id: uuid.UUID,
     event_data: CalendarEventUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Update a calendar event"""
     
-    try:
-        event_uuid = uuid.UUID(event_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid event ID format")
-    
-    event = db.query(CalendarEvent).filter(
-        CalendarEvent.id == event_uuid,
+    user_event = (
+        CalendarEvent.id == event_id,
         CalendarEvent.user_id == current_user.id
-    ).first()
+    )
+    
+    # Update fields that are provided, getting the updated row back from the UPDATE itself
+    update_data = event_data.model_dump(exclude_unset=True)
+    if update_data:
+        stmt = select(CalendarEvent).from_statement(
+            update(CalendarEvent).where(*user_event).values(**update_data).returning(CalendarEvent)
+        )
+    else:
+        stmt = select(CalendarEvent).options(raiseload("*")).where(*user_event)
+    event = (await db.execute(stmt)).scalars().first()
     
     if not event:
+        await db.rollback()
         raise HTTPException(status_code=404, detail="Event not found")
     
-    # Update fields that are provided
-    update_data = event_data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(event, field, value)
+    await db.commit()
     
-    db.commit()
-    db.refresh(event)
-    
-    return CalendarEventResponse(**event.to_dict())
+    return event
 
 @router.delete("/events/{event_id}")
 async def delete_event(
-    event_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    event_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Delete a calendar event"""
     
-    try:
-        event_uuid = uuid.UUID(event_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid event ID format")
-    
-    event = db.query(CalendarEvent).filter(
-        CalendarEvent.id == event_uuid,
-        CalendarEvent.user_id == current_user.id
-    ).first()
+    event = (await db.execute(
+        select(CalendarEvent).where(
+            CalendarEvent.id == event_id,
+            CalendarEvent.user_id == current_user.id
+        )
+    )).scalars().first()
     
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    db.delete(event)
-    db.commit()
+    await db.delete(event)
+    await db.commit()
     
     return JSONResponse(content={"message": "Event deleted successfully"})
 
 @router.get("/event-types")
-async def get_event_types():
+async def get_event_types(request: Request):
     """Get available event types and their colors"""
-    event_types = [
-        {"type": "flight", "label": "Flight", "color": "bg-blue-500"},
-        {"type": "accommodation", "label": "Accommodation", "color": "bg-green-500"},
-        {"type": "activity", "label": "Activity", "color": "bg-purple-500"},
-        {"type": "transport", "label": "Transport", "color": "bg-cyan-500"},
-        {"type": "dining", "label": "Dining", "color": "bg-yellow-500"},
-        {"type": "wellness", "label": "Wellness", "color": "bg-pink-500"}
-    ]
-    return {"event_types": event_types}
+    if request.headers.get("if-none-match") == EVENT_TYPE_OPTIONS_HEADERS["ETag"]:
+        return Response(status_code=304, headers=EVENT_TYPE_OPTIONS_HEADERS)
+    return Response(
+        content=EVENT_TYPE_OPTIONS_JSON,
+        media_type="application/json",
+        headers=EVENT_TYPE_OPTIONS_HEADERS
+    )
 
 @router.get("/stats")
 async def get_calendar_stats(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Get calendar statistics for the user"""
     
-    query = db.query(CalendarEvent).filter(CalendarEvent.user_id == current_user.id)
+    filters = [CalendarEvent.user_id == current_user.id]
     
     # Apply date filters if provided
     if start_date:
-        query = query.filter(CalendarEvent.start_datetime >= start_date)
+        filters.append(CalendarEvent.start_datetime >= start_date)
     if end_date:
-        end_datetime = datetime.combine(end_date, datetime.min.time()) + timedelta(days=1)
-        query = query.filter(CalendarEvent.start_datetime < end_datetime)
+        end_datetime = datetime.combine(end_date, time.min) + ONE_DAY
+        filters.append(CalendarEvent.start_datetime < end_datetime)
     
-    # Get total count
-    total_events = query.count()
-    
-    # Get count by event type
-    event_type_counts = (
-        query.with_entities(CalendarEvent.event_type, func.count(CalendarEvent.id))
+    # Get count by event type; the total is their sum
+    event_type_counts = (await db.execute(
+        select(CalendarEvent.event_type, func.count(CalendarEvent.id))
+        .where(*filters)
         .group_by(CalendarEvent.event_type)
-        .all()
-    )
+    )).all()
+    total_events = sum(count for _, count in event_type_counts)
     
     return {
         "total_events": total_events,
@@ -323,34 +303,17 @@ async def get_calendar_stats(
 
 # Suggested Events Endpoints
 
-@router.post("/events/suggest", response_model=CalendarEventResponse)
+@router.post("/events/suggest", response_model=CalendarEventOut)
 async def create_suggested_event(
     event_data: SuggestedEventCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Create a suggested calendar event (typically called by agent)"""
     
-    # Validate document_id if provided
-    document_uuid = None
-    if event_data.document_id:
-        try:
-            document_uuid = uuid.UUID(event_data.document_id)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid document ID format")
-    
     # Set default color based on event type if not provided
-    color_map = {
-        "flight": "bg-blue-500",
-        "accommodation": "bg-green-500", 
-        "activity": "bg-purple-500",
-        "transport": "bg-cyan-500",
-        "dining": "bg-yellow-500",
-        "wellness": "bg-pink-500"
-    }
-    
     if not event_data.color:
-        event_data.color = color_map.get(event_data.event_type, "bg-gray-500")
+        event_data.color = EVENT_COLORS.get(event_data.event_type, DEFAULT_EVENT_COLOR)
     
     # Create the suggested event
     event = CalendarEvent(
@@ -365,7 +328,7 @@ async def create_suggested_event(
         color=event_data.color,
         status="suggested",  # Always suggested for this endpoint
         notes=event_data.notes,
-        document_id=document_uuid,
+        document_id=event_data.document_id,
         source="agent",
         suggestion_reason=event_data.suggestion_reason,
         suggestion_confidence=event_data.suggestion_confidence,
@@ -373,96 +336,87 @@ async def create_suggested_event(
     )
     
     db.add(event)
-    db.commit()
-    db.refresh(event)
+    await db.commit()
     
-    return CalendarEventResponse(**event.to_dict())
+    return event
 
 
-@router.post("/events/{event_id}/approve", response_model=CalendarEventResponse)
+@router.post("/events/{event_id}/approve", response_model=CalendarEventOut)
 async def approve_suggested_event(
-    event_id: str,
+    event_id: uuid.UUID,
     approval_data: EventApprovalRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Approve or reject a suggested event"""
     
-    try:
-        event_uuid = uuid.UUID(event_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid event ID format")
-    
-    event = db.query(CalendarEvent).filter(
-        CalendarEvent.id == event_uuid,
+    pending_suggestion = update(CalendarEvent).where(
+        CalendarEvent.id == event_id,
         CalendarEvent.user_id == current_user.id,
         CalendarEvent.status == "suggested"
-    ).first()
-    
-    if not event:
-        raise HTTPException(status_code=404, detail="Suggested event not found")
+    )
     
     if approval_data.approved:
-        # Create a new confirmed event based on the suggestion
-        approved_event = CalendarEvent(
-            user_id=current_user.id,
-            title=event.title,
-            description=event.description,
-            location=event.location,
-            start_datetime=event.start_datetime,
-            end_datetime=event.end_datetime,
-            all_day=event.all_day,
-            event_type=event.event_type,
-            color=event.color,
-            status="confirmed",
-            notes=event.notes,
-            document_id=event.document_id,
-            source="approved_suggestion",
-            parent_event_id=event.id
-        )
-        
-        db.add(approved_event)
-        
-        # Keep the original suggested event for reference but mark it as processed
-        event.user_feedback = approval_data.user_feedback or "Approved"
+        # Keep the original suggested event for reference but mark it as processed,
+        # and create the confirmed copy from the same row in one statement
+        approved_suggestion = pending_suggestion.values(
+            user_feedback=approval_data.user_feedback or "Approved"
+        ).returning(
+            CalendarEvent.id, *[getattr(CalendarEvent, field) for field in APPROVED_EVENT_FIELDS]
+        ).cte("approved_suggestion")
         
-        db.commit()
-        db.refresh(approved_event)
-        
-        return CalendarEventResponse(**approved_event.to_dict())
+        create_approved_event = insert(CalendarEvent).from_select(
+            ["user_id", *APPROVED_EVENT_FIELDS, "status", "source", "parent_event_id"],
+            select(
+                literal(current_user.id, CalendarEvent.user_id.type),
+                *[approved_suggestion.c[field] for field in APPROVED_EVENT_FIELDS],
+                literal("confirmed"),
+                literal("approved_suggestion"),
+                approved_suggestion.c.id
+            )
+        ).returning(CalendarEvent)
+        event = (await db.execute(
+            select(CalendarEvent).from_statement(create_approved_event)
+        )).scalars().first()
     else:
-        # Reject the suggestion
-        event.user_feedback = approval_data.user_feedback or "Rejected"
-        event.status = "cancelled"  # Mark as cancelled to hide from suggested events
-        
-        db.commit()
-        db.refresh(event)
-        
-        return CalendarEventResponse(**event.to_dict())
+        # Reject the suggestion; cancelled events are hidden from suggested events
+        event = (await db.execute(
+            select(CalendarEvent).from_statement(
+                pending_suggestion.values(
+                    user_feedback=approval_data.user_feedback or "Rejected",
+                    status="cancelled"
+                ).returning(CalendarEvent)
+            )
+        )).scalars().first()
+    
+    if not event:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Suggested event not found")
+    
+    await db.commit()
+    
+    return event
 
 @router.delete("/events/{event_id}/suggestion")
 async def delete_suggested_event(
-    event_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    event_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Delete a suggested event completely"""
     
-    try:
-        event_uuid = uuid.UUID(event_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid event ID format")
-    
-    event = db.query(CalendarEvent).filter(
-        CalendarEvent.id == event_uuid,
-        CalendarEvent.user_id == current_user.id,
-        CalendarEvent.status == "suggested"
-    ).first()
+    event = (await db.execute(
+        select(CalendarEvent).where(
+            CalendarEvent.id == event_id,
+            CalendarEvent.user_id == current_user.id,
+            CalendarEvent.status == "suggested"
+        )
+    )).scalars().first()
     
     if not event:
         raise HTTPException(status_code=404, detail="Suggested event not found")
     
-    db.delete(event)
-    db.commit()
+    await db.delete(event)
+    await db.commit()
     
     return JSONResponse(content={"message": "Suggested event deleted successfully"})
\ No newline at end of file
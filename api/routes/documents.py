@@ -1,26 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sse_starlette import EventSourceResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
+from sqlalchemy.orm import Session, defer, load_only
+from sqlalchemy import func, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from typing import List, Optional, Tuple
+from datetime import datetime
 import uuid
 import asyncio
 import json
+import base64
+import contextlib
 import hashlib
+import os
+import tempfile
 from io import BytesIO
 
 from database import get_db
-from models.user import User
+from models.user import AuthenticatedUser
 from models.document import Document, DocumentCategory, DocumentQuickRef
 from services.document_processor import DocumentProcessor
 from services.auth import get_current_user
+from services.category_cache import invalidate_categories
+from services.search_cache import invalidate_search
 
 router = APIRouter()
 
 # File upload validation
 MAX_FILE_SIZE = 4.5 * 1024 * 1024  # 4.5MB
 ALLOWED_EXTENSIONS = {".pdf"}
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Columns GET /api/documents/ returns for each document
+DOCUMENT_LIST_COLUMNS = (
+    Document.id, Document.title, Document.original_filename, Document.category_id,
+    Document.processing_status, Document.confidence_score, Document.created_at,
+    Document.updated_at, Document.summary, Document.error_message
+)
 
 def validate_file(file: UploadFile) -> None:
     """Validate uploaded file"""
@@ -38,13 +55,46 @@ def validate_file(file: UploadFile) -> None:
             detail=f"File size exceeds maximum limit of {MAX_FILE_SIZE / (1024 * 1024):.1f}MB"
         )
 
+async def save_upload(file: UploadFile) -> Tuple[str, str, int]:
+    """
+    Stream an upload to a temporary .pdf file, hashing it on the way
+
+    Returns (path, sha256 hex digest, size); the caller owns the file.
+    """
+    # Content fingerprint only (OpenSSL-backed, so SHA-NI is used where the CPU has it)
+    hasher = hashlib.sha256(usedforsecurity=False)
+    size = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
+        try:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File {file.filename} exceeds maximum size limit"
+                    )
+                hasher.update(chunk)
+                temp_file.write(chunk)
+        except BaseException:
+            temp_file.close()
+            discard_upload(temp_file.name)
+            raise
+    return temp_file.name, hasher.hexdigest(), size
+
+
+def discard_upload(path: str) -> None:
+    """Delete a temporary upload file that won't be processed"""
+    with contextlib.suppress(OSError):
+        os.unlink(path)
+
+
 @router.post("/upload")
 @router.post("/upload/")  # Handle both with and without trailing slash
 async def upload_documents(
     background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Upload one or more documents for processing"""
     
@@ -56,22 +106,18 @@ async def upload_documents(
     
     uploaded_documents = []
     processor = DocumentProcessor(db)
+    # Temp files written so far; their background tasks only run if the whole batch succeeds
+    saved_paths = []
     
     for file in files:
         try:
             # Validate file
             validate_file(file)
             
-            # Read file content
-            content = await file.read()
-            if len(content) > MAX_FILE_SIZE:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"File {file.filename} exceeds maximum size limit"
-                )
-            
-            # Calculate file hash for duplicate detection
-            file_hash = hashlib.sha256(content).hexdigest()
+            # Stream to disk, hashing for duplicate detection; memory use stays
+            # at one chunk regardless of file size
+            file_path, file_hash, file_size = await save_upload(file)
+            saved_paths.append(file_path)
             
             # Check for duplicates
             existing_doc = db.query(Document).filter(
@@ -80,6 +126,7 @@ async def upload_documents(
             ).first()
             
             if existing_doc:
+                discard_upload(saved_paths.pop())
                 uploaded_documents.append({
                     "id": str(existing_doc.id),
                     "filename": file.filename,
@@ -99,7 +146,7 @@ async def upload_documents(
                 title=file.filename or "Untitled Document",
                 original_filename=file.filename,
                 file_hash=file_hash,
-                file_size=len(content),
+                file_size=file_size,
                 processing_status="pending"
             )
             
@@ -107,11 +154,11 @@ async def upload_documents(
             db.commit()
             db.refresh(document)
             
-            # Schedule background processing
+            # Schedule background processing; the processor deletes the file
             background_tasks.add_task(
                 processor.process_document_async,
                 document.id,
-                content
+                file_path
             )
             
             uploaded_documents.append({
@@ -122,8 +169,12 @@ async def upload_documents(
             })
             
         except HTTPException:
+            for path in saved_paths:
+                discard_upload(path)
             raise
         except Exception as e:
+            for path in saved_paths:
+                discard_upload(path)
             raise HTTPException(status_code=500, detail=f"Failed to upload {file.filename}: {str(e)}")
     
     return {
@@ -131,33 +182,73 @@ async def upload_documents(
         "total_uploaded": len(uploaded_documents)
     }
 
+def encode_document_cursor(document: Document) -> str:
+    """Opaque keyset cursor pointing just past `document` in the listing order"""
+    payload = json.dumps([document.created_at.isoformat(), str(document.id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_document_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a cursor from encode_document_cursor into (created_at, id)"""
+    try:
+        created_at, document_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), uuid.UUID(document_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/")
-async def get_documents(
-    skip: int = 0,
+def get_documents(
+    skip: int = Query(0, deprecated=True, description="Offset paging; use cursor instead"),
     limit: int = 50,
+    cursor: Optional[str] = None,
     category_id: Optional[int] = None,
     status: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
-    """Get user's documents with optional filtering"""
+    """
+    Get user's documents with optional filtering
+    
+    Pass the previous page's `next_cursor` as `cursor` to page through the list;
+    every page is a single index seek. The deprecated `skip` offset is still
+    honoured when no cursor is given.
+    """
     
-    query = db.query(Document).filter(Document.user_id == current_user.id)
+    filters = [Document.user_id == current_user.id]
     
     if category_id:
-        query = query.filter(Document.category_id == category_id)
+        filters.append(Document.category_id == category_id)
     
     if status:
-        query = query.filter(Document.processing_status == status)
+        filters.append(Document.processing_status == status)
     
-    # Order by creation date (newest first)
-    query = query.order_by(Document.created_at.desc())
+    # Total count over the filters (not the cursor). It rides along with the page as an
+    # uncorrelated subquery, evaluated once, so the page itself stays an index seek.
+    total_count = select(func.count()).select_from(Document).where(*filters)
+    
+    # Order by creation date (newest first), id breaks ties so pages never overlap
+    # Only the listed columns are loaded - raw_text and search_tsv stay in the database
+    query = db.query(
+        Document, total_count.scalar_subquery().correlate(None).label("total")
+    ).options(load_only(*DOCUMENT_LIST_COLUMNS)).filter(*filters).order_by(
+        Document.created_at.desc(), Document.id.desc()
+    )
     
     # Apply pagination
-    documents = query.offset(skip).limit(limit).all()
+    if cursor:
+        cursor_created_at, cursor_id = decode_document_cursor(cursor)
+        query = query.filter(
+            tuple_(Document.created_at, Document.id) < tuple_(cursor_created_at, cursor_id)
+        )
+    else:
+        query = query.offset(skip)
+    rows = query.limit(limit).all()
+    documents = [row.Document for row in rows]
+    # An empty page carries no total, so count separately only then
+    total = rows[0].total if rows else db.scalar(total_count)
     
-    # Get total count
-    total = query.count()
+    next_cursor = encode_document_cursor(documents[-1]) if len(documents) == limit else None
     
     return {
         "documents": [
@@ -177,14 +268,15 @@ async def get_documents(
         ],
         "total": total,
         "skip": skip,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": next_cursor
     }
 
 @router.get("/categories")
 @router.get("/categories/")
-async def get_categories(
+def get_categories(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Get all document categories"""
     
@@ -203,10 +295,10 @@ async def get_categories(
     }
 
 @router.get("/{document_id}")
-async def get_document(
+def get_document(
     document_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Get a specific document by ID"""
     
@@ -215,18 +307,28 @@ async def get_document(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid document ID format")
     
-    document = db.query(Document).filter(
+    # Quick reference fields come back in the same round-trip as a JSON array
+    quick_refs = select(func.coalesce(
+        func.json_agg(aggregate_order_by(
+            func.json_build_object(
+                "field_name", DocumentQuickRef.field_name,
+                "field_value", DocumentQuickRef.field_value,
+                "field_type", DocumentQuickRef.field_type
+            ),
+            DocumentQuickRef.id
+        )),
+        literal_column("'[]'::json")
+    )).where(DocumentQuickRef.document_id == Document.id).scalar_subquery()
+    
+    row = db.query(Document, quick_refs.label("quick_refs")).options(defer(Document.search_tsv)).filter(
         Document.id == doc_uuid,
         Document.user_id == current_user.id
     ).first()
     
-    if not document:
+    if not row:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    # Get quick reference fields
-    quick_refs = db.query(DocumentQuickRef).filter(
-        DocumentQuickRef.document_id == document.id
-    ).all()
+    document, quick_refs = row
     
     return {
         "id": str(document.id),
@@ -241,21 +343,14 @@ async def get_document(
         "error_message": document.error_message,
         "created_at": document.created_at,
         "updated_at": document.updated_at,
-        "quick_refs": [
-            {
-                "field_name": ref.field_name,
-                "field_value": ref.field_value,
-                "field_type": ref.field_type
-            }
-            for ref in quick_refs
-        ]
+        "quick_refs": quick_refs
     }
 
 @router.delete("/{document_id}")
-async def delete_document(
+def delete_document(
     document_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Delete a document"""
     
@@ -274,6 +369,8 @@ async def delete_document(
     
     db.delete(document)
     db.commit()
+    invalidate_categories(current_user.id)
+    invalidate_search(current_user.id)
     
     return {"message": "Document deleted successfully"}
 
@@ -281,7 +378,7 @@ async def delete_document(
 async def get_processing_status(
     document_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Get real-time processing status via Server-Sent Events"""
     
@@ -290,13 +387,16 @@ async def get_processing_status(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid document ID format")
     
+    def load_document():
+        return db.query(Document).filter(
+            Document.id == doc_uuid,
+            Document.user_id == current_user.id
+        ).first()
+    
     async def event_generator():
         while True:
-            # Check document status in database
-            document = db.query(Document).filter(
-                Document.id == doc_uuid,
-                Document.user_id == current_user.id
-            ).first()
+            # Check document status in database (sync session, so off the event loop)
+            document = await run_in_threadpool(load_document)
             
             if not document:
                 yield {
@@ -338,7 +438,7 @@ async def reprocess_document(
     document_id: str,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Reprocess an existing document with current AI model"""
     
@@ -382,7 +482,7 @@ async def reprocess_document(
                     category_name = ai_result.get("category")
                     if category_name:
                         category = db.query(DocumentCategory).filter(
-                            DocumentCategory.name.ilike(f"%{category_name}%")
+                            DocumentCategory.name.icontains(category_name, autoescape=True)
                         ).first()
                         if category:
                             document.category_id = category.id
@@ -405,6 +505,8 @@ async def reprocess_document(
                 # Mark as completed
                 document.processing_status = "completed"
                 db.commit()
+                invalidate_categories(document.user_id)
+                invalidate_search(document.user_id)
             else:
                 document.processing_status = "failed"
                 document.error_message = "AI processing unavailable"
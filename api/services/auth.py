@@ -1,23 +1,46 @@
 """
 Production-grade authentication service with proper NextAuth integration
 """
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, Header, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional
+import hashlib
 import structlog
+import time
 
 from database import get_db
-from models.user import User
+from models.user import AuthenticatedUser, User
 from .nextauth_validator import get_user_from_authorization
 
 logger = structlog.get_logger(__name__)
 
+AUTH_CACHE_TTL_SECONDS = 60
+
+# Authenticated user snapshot per session credential (keyed by token hash), so
+# repeat requests skip token validation and the user lookup for a short while.
+# Never an ORM User: that would be bound to (and expired by) one request's session.
+_authenticated_users: TTLCache = TTLCache(maxsize=10_000, ttl=AUTH_CACHE_TTL_SECONDS)
+
+
+def _credential_key(credential: str) -> bytes:
+    return hashlib.sha256(credential.encode()).digest()
+
+
+def _remember_user(credential_key: bytes, user: AuthenticatedUser, user_info: dict) -> None:
+    """Cache an authenticated user unless the token expires within the cache TTL"""
+    exp = user_info.get("exp")
+    if exp and exp < time.time() + AUTH_CACHE_TTL_SECONDS:
+        return
+    _authenticated_users[credential_key] = user
+
 
 async def get_current_user(
     request: Request,
     authorization: Optional[str] = Header(None),
     db: Session = Depends(get_db)
-) -> User:
+) -> AuthenticatedUser:
     """
     Get authenticated user from NextAuth.js session
     """
@@ -29,11 +52,18 @@ async def get_current_user(
     
     # Method 1: Try Authorization header (for API calls)
     if authorization:
+        credential_key = _credential_key(authorization)
+        user = _authenticated_users.get(credential_key)
+        if user is not None:
+            return user
+        
         logger.info("Trying Authorization header authentication")
         user_info = await get_user_from_authorization(authorization)
         if user_info:
             logger.info("Authorization header authentication successful", email=user_info.get("email"))
-            return await get_or_create_user_from_nextauth(user_info, db)
+            user = await get_or_create_user_from_nextauth(user_info, db)
+            _remember_user(credential_key, user, user_info)
+            return user
         else:
             logger.warning("Authorization header authentication failed")
     
@@ -55,6 +85,11 @@ async def get_current_user(
             break
     
     if session_token:
+        credential_key = _credential_key(session_token)
+        user = _authenticated_users.get(credential_key)
+        if user is not None:
+            return user
+        
         logger.info("Trying cookie authentication", 
                    cookie_name=found_cookie_name,
                    token_prefix=session_token[:20])
@@ -62,7 +97,9 @@ async def get_current_user(
         user_info = await get_user_from_nextauth_token(session_token)
         if user_info:
             logger.info("Cookie authentication successful", email=user_info.get("email"))
-            return await get_or_create_user_from_nextauth(user_info, db)
+            user = await get_or_create_user_from_nextauth(user_info, db)
+            _remember_user(credential_key, user, user_info)
+            return user
         else:
             logger.warning("Cookie authentication failed")
     
@@ -76,9 +113,24 @@ async def get_current_user(
 async def get_or_create_user_from_nextauth(
     user_info: dict, 
     db: Session
-) -> User:
+) -> AuthenticatedUser:
     """
     Create or get user from NextAuth user information
+    
+    The lookup uses the sync session, so it runs in the threadpool to keep the
+    event loop free while authenticating. Returns a snapshot taken straight after
+    the lookup, before the request's session can commit and expire the row.
+    """
+    user = await run_in_threadpool(_get_or_create_user_from_nextauth, user_info, db)
+    return AuthenticatedUser.model_validate(user)
+
+
+def _get_or_create_user_from_nextauth(
+    user_info: dict, 
+    db: Session
+) -> User:
+    """
+    Create or get user from NextAuth user information (blocking)
     """
     try:
         email = user_info.get("email")
@@ -0,0 +1,28 @@
+"""
+Per-user cache for the agent's get_document_categories tool
+
+The agent calls get_document_categories as a planning step on most turns,
+while the counts only change when documents are added, removed or
+(re)classified. Responses are cached as pre-encoded JSON for a minute, and
+every document write drops the owner's entry right away.
+"""
+from typing import Any, Optional
+
+from cachetools import TTLCache
+
+_category_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+
+def get_cached_categories(user_id: Any) -> Optional[bytes]:
+    """Cached get_document_categories response body for a user, if fresh"""
+    return _category_cache.get(str(user_id))
+
+
+def cache_categories(user_id: Any, body: bytes) -> None:
+    """Store a user's encoded get_document_categories response"""
+    _category_cache[str(user_id)] = body
+
+
+def invalidate_categories(user_id: Any) -> None:
+    """Drop a user's cached categories after their documents changed"""
+    _category_cache.pop(str(user_id), None)
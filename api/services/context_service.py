@@ -1,10 +1,12 @@
 """
 Context service for providing agent with current date/time and trip summary
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any
+import uuid
 import pytz
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.user import User
 from models.document import Document, DocumentCategory
@@ -23,34 +25,41 @@ class TravelContextService:
         return f"Today is {formatted}"
     
     @staticmethod
-    async def get_trip_summary(user_id: str, db: Session) -> str:
+    async def get_trip_summary(user_id: str, db: AsyncSession) -> str:
         """Generate a concise trip summary for the user"""
         try:
             # Get user with proper migration handling
             user_uuid = await UserMigrationService.get_accessible_user_id(user_id, db)
             if not user_uuid:
                 return "No user data available"
+            user_uuid = uuid.UUID(user_uuid)
             
             # Get document count by category
-            from sqlalchemy import func
-            category_stats = db.query(
-                DocumentCategory.name,
-                func.count(Document.id).label("count")
-            ).join(
-                Document, Document.category_id == DocumentCategory.id
-            ).filter(
-                Document.user_id == user_uuid
-            ).group_by(DocumentCategory.name).all()
+            category_stats = (await db.execute(
+                select(
+                    DocumentCategory.name,
+                    func.count(Document.id).label("count")
+                ).join(
+                    Document, Document.category_id == DocumentCategory.id
+                ).where(
+                    Document.user_id == user_uuid
+                ).group_by(DocumentCategory.name)
+            )).all()
             
             # Get upcoming events (next 30 days)
-            from datetime import timedelta
-            future_cutoff = datetime.now(pytz.UTC) + timedelta(days=30)
-            upcoming_events = db.query(CalendarEvent).filter(
-                CalendarEvent.user_id == user_uuid,
-                CalendarEvent.start_datetime >= datetime.now(pytz.UTC),
-                CalendarEvent.start_datetime <= future_cutoff,
-                CalendarEvent.status.in_(["confirmed", "tentative"])
-            ).order_by(CalendarEvent.start_datetime).limit(5).all()
+            now = datetime.now(pytz.UTC)
+            future_cutoff = now + timedelta(days=30)
+            upcoming_events = (await db.execute(
+                select(
+                    CalendarEvent.title,
+                    CalendarEvent.start_datetime
+                ).where(
+                    CalendarEvent.user_id == user_uuid,
+                    CalendarEvent.start_datetime >= now,
+                    CalendarEvent.start_datetime <= future_cutoff,
+                    CalendarEvent.status.in_(["confirmed", "tentative"])
+                ).order_by(CalendarEvent.start_datetime).limit(5)
+            )).all()
             
             # Build summary
             total_docs = sum(cat.count for cat in category_stats)
@@ -80,9 +89,9 @@ class TravelContextService:
             return f"Unable to generate trip summary: {str(e)}"
     
     @staticmethod
-    async def get_agent_context(user_id: str, db: Session) -> Dict[str, Any]:
+    async def get_agent_context(user_id: str, db: AsyncSession) -> Dict[str, Any]:
         """Get complete context for agent conversations"""
         return {
             "currentDateTime": TravelContextService.get_current_datetime(),
             "projectSummary": await TravelContextService.get_trip_summary(user_id, db)
-        }
\ No newline at end of file
+        }
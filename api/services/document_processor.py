@@ -3,7 +3,6 @@ import json
 import logging
 from typing import Optional, Dict, Any, List
 from io import BytesIO
-import tempfile
 import os
 
 from docling.document_converter import DocumentConverter
@@ -12,6 +11,8 @@ from sqlalchemy.orm import Session
 import anthropic
 
 from models.document import Document, DocumentCategory, DocumentQuickRef
+from services.category_cache import invalidate_categories
+from services.search_cache import invalidate_search
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -30,8 +31,8 @@ class DocumentProcessor:
         else:
             self.claude_client = anthropic.Anthropic(api_key=api_key)
     
-    async def process_document_async(self, document_id: str, file_content: bytes):
-        """Process document asynchronously"""
+    async def process_document_async(self, document_id: str, file_path: str):
+        """Process an uploaded document asynchronously, deleting its file when done"""
         try:
             # Update status to processing
             document = self.db.query(Document).filter(Document.id == document_id).first()
@@ -44,13 +45,14 @@ class DocumentProcessor:
             
             # Extract text using Docling
             logger.info(f"Extracting text from document {document_id}")
-            raw_text = await self._extract_text(file_content, document.original_filename)
+            raw_text = await self._extract_text(file_path, document.original_filename)
             
             if not raw_text:
                 raise Exception("Failed to extract text from document")
             
             document.raw_text = raw_text
             self.db.commit()
+            invalidate_search(document.user_id)
             
             # Process with Claude AI if available
             if self.claude_client:
@@ -68,7 +70,7 @@ class DocumentProcessor:
                     if category_name:
                         # First try to find existing category
                         category = self.db.query(DocumentCategory).filter(
-                            DocumentCategory.name.ilike(f"%{category_name}%")
+                            DocumentCategory.name.icontains(category_name, autoescape=True)
                         ).first()
                         
                         if not category:
@@ -99,6 +101,8 @@ class DocumentProcessor:
             # Mark as completed
             document.processing_status = "completed"
             self.db.commit()
+            invalidate_categories(document.user_id)
+            invalidate_search(document.user_id)
             
             logger.info(f"Document {document_id} processed successfully")
             
@@ -111,32 +115,24 @@ class DocumentProcessor:
                 document.processing_status = "failed"
                 document.error_message = str(e)
                 self.db.commit()
+        finally:
+            try:
+                os.unlink(file_path)
+            except OSError:
+                pass
     
-    async def _extract_text(self, file_content: bytes, filename: Optional[str] = None) -> str:
-        """Extract text from PDF using Docling"""
+    async def _extract_text(self, file_path: str, filename: Optional[str] = None) -> str:
+        """Extract text from a PDF on disk using Docling"""
         try:
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                temp_file.write(file_content)
-                temp_file.flush()
-                
-                try:
-                    # Convert document
-                    result = self.converter.convert(temp_file.name)
-                    
-                    # Extract markdown text
-                    if result and result.document:
-                        return result.document.export_to_markdown()
-                    else:
-                        logger.warning("No document content extracted")
-                        return ""
-                        
-                finally:
-                    # Clean up temp file
-                    try:
-                        os.unlink(temp_file.name)
-                    except:
-                        pass
+            # Convert document
+            result = self.converter.convert(file_path)
+            
+            # Extract markdown text
+            if result and result.document:
+                return result.document.export_to_markdown()
+            else:
+                logger.warning("No document content extracted")
+                return ""
                         
         except Exception as e:
             logger.error(f"Error extracting text: {str(e)}")
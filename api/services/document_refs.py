@@ -0,0 +1,54 @@
+"""
+Opaque document references handed to the agent
+
+search_documents returns refs like "doc_<token>", where the token is the
+document UUID signed with a timestamp. get_document resolves a ref without
+touching the database, and a ref keeps pointing at the same document even if
+new documents are uploaded between the two tool calls.
+"""
+import base64
+import functools
+import os
+import uuid
+from typing import Optional
+
+from itsdangerous import BadSignature, TimestampSigner
+
+REF_PREFIX = "doc_"
+REF_MAX_AGE_SECONDS = 600
+
+
+@functools.cache
+def _signer() -> TimestampSigner:
+    secret = os.getenv("DOCUMENT_REF_SECRET") or os.getenv("NEXTAUTH_SECRET")
+    if not secret:
+        raise ValueError("DOCUMENT_REF_SECRET or NEXTAUTH_SECRET environment variable is required")
+    return TimestampSigner(secret, salt="kohtravel.document-ref")
+
+
+def is_document_ref(value: str) -> bool:
+    """Check if a document_id parameter is a ref rather than a UUID"""
+    return isinstance(value, str) and value.startswith(REF_PREFIX)
+
+
+def make_document_ref(document_id: uuid.UUID) -> str:
+    """Build a signed, short-lived ref for a document"""
+    if not isinstance(document_id, uuid.UUID):
+        document_id = uuid.UUID(str(document_id))
+    payload = base64.urlsafe_b64encode(document_id.bytes).rstrip(b"=")
+    return REF_PREFIX + _signer().sign(payload).decode("ascii")
+
+
+def resolve_document_ref(ref: str) -> Optional[uuid.UUID]:
+    """
+    Resolve a ref back to its document UUID
+
+    Returns None if the ref is malformed, tampered with or older than
+    REF_MAX_AGE_SECONDS.
+    """
+    token = ref[len(REF_PREFIX):].encode("ascii", errors="ignore")
+    try:
+        payload = _signer().unsign(token, max_age=REF_MAX_AGE_SECONDS)
+        return uuid.UUID(bytes=base64.urlsafe_b64decode(payload + b"=" * (-len(payload) % 4)))
+    except (BadSignature, ValueError):
+        return None
@@ -0,0 +1,40 @@
+"""
+Per-user cache for the agent's search_documents tool
+
+Agents often repeat the same search within a conversation (follow-up
+questions, retries after a tool error). Encoded responses are kept per user
+for a couple of minutes, keyed by the search arguments; any write to the
+user's documents drops all of their entries at once.
+"""
+from typing import Any, Dict, Hashable, Optional
+
+from cachetools import TTLCache
+
+# Entries per user; the oldest search is evicted beyond this
+MAX_SEARCHES_PER_USER = 64
+
+# user_id -> {search key: encoded response}; a user's bucket expires as a whole
+_search_cache: TTLCache = TTLCache(maxsize=10_000, ttl=120)
+
+
+def get_cached_search(user_id: Any, key: Hashable) -> Optional[bytes]:
+    """Cached search_documents response body for a user's search, if fresh"""
+    bucket: Optional[Dict[Hashable, bytes]] = _search_cache.get(str(user_id))
+    if bucket is None:
+        return None
+    return bucket.get(key)
+
+
+def cache_search(user_id: Any, key: Hashable, body: bytes) -> None:
+    """Store a user's encoded search_documents response"""
+    bucket = _search_cache.get(str(user_id))
+    if bucket is None:
+        bucket = _search_cache[str(user_id)] = {}
+    elif len(bucket) >= MAX_SEARCHES_PER_USER:
+        bucket.pop(next(iter(bucket)))
+    bucket[key] = body
+
+
+def invalidate_search(user_id: Any) -> None:
+    """Drop a user's cached searches after their documents changed"""
+    _search_cache.pop(str(user_id), None)
@@ -0,0 +1,163 @@
+"""
+BM25 relevance ranking for document search
+
+PostgreSQL's ts_rank_cd has no IDF or length normalisation, so search
+candidates are re-ranked in Python with BM25F: every occurrence of a term
+counts with the weight of the field it came from (search_tsv labels title A,
+summary B, raw text C, structured data D). Per-user corpus statistics
+(document count, average length, document frequencies) are cached for a few
+minutes.
+"""
+import math
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from cachetools import TTLCache
+from sqlalchemy import any_, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, REAL, array
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.document import Document
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# ts_rank_cd weight array, ordered {D, C, B, A}
+TS_RANK_WEIGHTS = (0.1, 0.2, 0.4, 1.0)
+
+# The same field weights for BM25F, relative to the document body (C)
+FIELD_WEIGHTS = {
+    label: weight / TS_RANK_WEIGHTS[1]
+    for label, weight in zip("DCBA", TS_RANK_WEIGHTS)
+}
+
+# user_id -> (doc_count, avg_doc_length)
+_corpus_size_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+# (user_id, term) -> number of the user's documents containing the term
+_doc_freq_cache: TTLCache = TTLCache(maxsize=100_000, ttl=300)
+
+
+def weighted_rank(ts_query):
+    """Field-weighted ts_rank_cd of the current document's search_tsv"""
+    weights = cast(array(TS_RANK_WEIGHTS), ARRAY(REAL))
+    return func.ts_rank_cd(weights, Document.search_tsv, ts_query)
+
+
+def term_frequencies_column(query: str):
+    """
+    Correlated scalar subquery returning {lexeme: [field labels]} for the
+    query's lexemes in the current document's search_tsv (one label per
+    occurrence)
+    """
+    lexemes = func.unnest(Document.search_tsv).table_valued("lexeme", "positions", "weights").render_derived()
+    query_lexemes = func.tsvector_to_array(func.to_tsvector("simple", query))
+    return select(
+        func.coalesce(
+            func.jsonb_object_agg(lexemes.c.lexeme, lexemes.c.weights),
+            literal({}, JSONB),
+            type_=JSONB
+        )
+    ).where(
+        lexemes.c.lexeme == any_(query_lexemes)
+    ).scalar_subquery().label("term_frequencies")
+
+
+def document_length_column():
+    """Document length used for BM25 normalisation (distinct lexemes in search_tsv)"""
+    return func.coalesce(func.length(Document.search_tsv), 0).label("doc_length")
+
+
+async def get_corpus_stats(user_uuid: Any, terms: Iterable[str], db: AsyncSession) -> Tuple[int, float, Dict[str, int]]:
+    """
+    Document count, average length and per-term document frequency for a user's corpus
+
+    The corpus size is cached per user and each document frequency per (user,
+    term), so a query only pays for terms that are new to the cache. Document
+    frequencies are per-term GIN-backed counts rather than a scan of the corpus.
+    """
+    user_key = str(user_uuid)
+    corpus = _corpus_size_cache.get(user_key)
+    doc_freqs: Dict[str, int] = {}
+    missing: List[str] = []
+    for term in sorted(set(terms)):
+        doc_freq = _doc_freq_cache.get((user_key, term))
+        if doc_freq is None:
+            missing.append(term)
+        else:
+            doc_freqs[term] = doc_freq
+    
+    if corpus is None or missing:
+        user_documents = Document.user_id == user_uuid
+        columns = [
+            select(func.count()).select_from(Document).where(
+                user_documents,
+                Document.search_tsv.op("@@")(func.plainto_tsquery("simple", term))
+            ).scalar_subquery()
+            for term in missing
+        ]
+        if corpus is None:
+            columns += [
+                select(func.count()).select_from(Document).where(user_documents).scalar_subquery(),
+                select(func.avg(func.length(Document.search_tsv))).where(user_documents).scalar_subquery()
+            ]
+        row = (await db.execute(select(*columns))).one()
+        
+        for term, doc_freq in zip(missing, row):
+            doc_freqs[term] = _doc_freq_cache[(user_key, term)] = doc_freq or 0
+        if corpus is None:
+            doc_count, avg_doc_length = row[len(missing):]
+            corpus = _corpus_size_cache[user_key] = (doc_count or 0, float(avg_doc_length or 0.0))
+    
+    return corpus[0], corpus[1], doc_freqs
+
+
+def weighted_term_frequency(labels: Sequence[str]) -> float:
+    """BM25F pseudo-frequency: each occurrence counts with its field weight"""
+    return sum(FIELD_WEIGHTS.get(label, 1.0) for label in labels)
+
+
+def bm25_score(
+    term_frequencies: Dict[str, float],
+    doc_length: int,
+    doc_count: int,
+    avg_doc_length: float,
+    doc_freqs: Dict[str, int],
+    k1: float = BM25_K1,
+    b: float = BM25_B
+) -> float:
+    """Okapi BM25 score of one document for the given (weighted) term frequencies"""
+    if not term_frequencies or not doc_count:
+        return 0.0
+
+    length_norm = 1 - b + b * (doc_length / avg_doc_length if avg_doc_length else 1.0)
+    score = 0.0
+    for term, tf in term_frequencies.items():
+        df = doc_freqs.get(term, 0)
+        idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+        score += idf * (tf * (k1 + 1)) / (tf + k1 * length_norm)
+    return score
+
+
+async def rank_bm25(rows: Sequence[Any], user_uuid: Any, db: AsyncSession, limit: int) -> List[Any]:
+    """
+    Re-rank search candidates by BM25 and return the top `limit`
+
+    Rows must carry the `term_frequencies` and `doc_length` columns. Ties keep
+    the incoming (SQL) order.
+    """
+    terms = set()
+    for row in rows:
+        terms.update((row.term_frequencies or {}).keys())
+    if not terms:
+        return list(rows[:limit])
+
+    doc_count, avg_doc_length, doc_freqs = await get_corpus_stats(user_uuid, terms, db)
+    scored = []
+    for idx, row in enumerate(rows):
+        term_frequencies = {
+            term: weighted_term_frequency(labels)
+            for term, labels in (row.term_frequencies or {}).items()
+        }
+        score = bm25_score(term_frequencies, row.doc_length, doc_count, avg_doc_length, doc_freqs)
+        scored.append((score, idx, row))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [row for _, _, row in scored[:limit]]
@@ -1,15 +1,23 @@
 """
 Production-grade user migration service for development phase
 """
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+from cachetools import TTLCache
 import structlog
 
 from models.user import User
 from models.document import Document
+from services.category_cache import invalidate_categories
+from services.search_cache import invalidate_search
 
 logger = structlog.get_logger(__name__)
 
+# email -> user_id for users whose documents are already in place
+_user_id_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
 
 class UserMigrationService:
     """
@@ -17,7 +25,7 @@ class UserMigrationService:
     """
     
     @staticmethod
-    async def get_accessible_user_id(email: str, db: Session) -> Optional[str]:
+    async def get_accessible_user_id(email: str, db: AsyncSession) -> Optional[str]:
         """
         Get user ID with proper access logic for development phase
         
@@ -25,19 +33,29 @@ class UserMigrationService:
         1. Find user by email
         2. If not found, create new user
         3. For development: grant access to dev documents if user has none
+        
+        Users who already own documents are cached per email for a few minutes,
+        so agent tool calls in the same conversation skip the lookup entirely.
         """
+        cached = _user_id_cache.get(email)
+        if cached is not None:
+            return cached
+        
         try:
             # Find existing user by email
-            user = db.query(User).filter(User.email == email).first()
+            user = (await db.execute(select(User).where(User.email == email))).scalars().first()
             
             if user:
                 user_id = str(user.id)
                 
                 # Check if user has any documents
-                doc_count = db.query(Document).filter(Document.user_id == user_id).count()
+                doc_count = await db.scalar(
+                    select(func.count()).select_from(Document).where(Document.user_id == user.id)
+                )
                 
                 if doc_count > 0:
                     logger.info("User has documents", email=email, doc_count=doc_count)
+                    _user_id_cache[email] = user_id
                     return user_id
                 else:
                     # User exists but no documents - check if we should migrate dev documents
@@ -51,7 +69,17 @@ class UserMigrationService:
             return None
     
     @staticmethod
-    async def _handle_empty_user(user: User, email: str, db: Session) -> str:
+    def invalidate_cache(email: Optional[str] = None) -> None:
+        """
+        Drop cached user ID resolutions (one email, or all of them)
+        """
+        if email is None:
+            _user_id_cache.clear()
+        else:
+            _user_id_cache.pop(email, None)
+    
+    @staticmethod
+    async def _handle_empty_user(user: User, email: str, db: AsyncSession) -> str:
         """
         Handle user with no documents - development phase logic
         """
@@ -67,15 +95,24 @@ class UserMigrationService:
         
         if email.lower() in [e.lower() for e in authorized_emails]:
             # Grant access to development documents by reassigning them
-            dev_user = db.query(User).filter(User.vercel_user_id == "dev_user_1").first()
+            dev_user = (await db.execute(
+                select(User).where(User.vercel_user_id == "dev_user_1")
+            )).scalars().first()
             if dev_user:
                 # Reassign documents to the authenticated user
-                updated_count = db.query(Document).filter(
-                    Document.user_id == str(dev_user.id)
-                ).update({"user_id": user_id})
+                result = await db.execute(
+                    update(Document).where(
+                        Document.user_id == dev_user.id
+                    ).values(user_id=user.id)
+                )
+                updated_count = result.rowcount
                 
                 if updated_count > 0:
-                    db.commit()
+                    await db.commit()
+                    # Document ownership moved - cached resolutions may be stale
+                    UserMigrationService.invalidate_cache()
+                    invalidate_categories(user_id)
+                    invalidate_search(user_id)
                     logger.info("Migrated dev documents to authenticated user", 
                                email=email, 
                                user_id=user_id,
@@ -86,7 +123,7 @@ class UserMigrationService:
         return user_id
     
     @staticmethod
-    async def _create_user_with_migration(email: str, db: Session) -> str:
+    async def _create_user_with_migration(email: str, db: AsyncSession) -> str:
         """
         Create new user with potential document migration
         """
@@ -98,8 +135,7 @@ class UserMigrationService:
         )
         
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
         
         logger.info("Created new user", email=email, user_id=str(new_user.id))
         
@@ -0,0 +1,162 @@
+"""
+Structured logging configuration for KohTravel API services
+"""
+import atexit
+import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+import structlog
+
+
+class RateLimitedSampler:
+    """
+    structlog processor that drops repeated errors beyond a per-second budget
+
+    Only error-level events are sampled; everything below always goes through.
+    Once more than `max_per_second` errors with the same event name and error
+    text are logged within the current one-second window, the rest are dropped
+    until the window rolls over. The next event after that is preceded by one
+    warning with the number of errors suppressed, so dropped events stay visible.
+    Keeps failure storms from flooding the log sink.
+    """
+    
+    SAMPLED_METHODS = frozenset({"error", "exception", "critical", "fatal"})
+    
+    def __init__(self, max_per_second: int = 100):
+        self.max_per_second = max_per_second
+        self._window = 0
+        self._counts: Dict[Tuple[Any, Any], int] = {}
+        self._suppressed: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+    
+    def __call__(self, logger, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        window = int(time.monotonic())
+        suppressed = None
+        drop = False
+        with self._lock:
+            if window != self._window:
+                self._window = window
+                self._counts.clear()
+                suppressed, self._suppressed = self._suppressed, {}
+            
+            if method_name in self.SAMPLED_METHODS:
+                event = event_dict.get("event")
+                key = (event, event_dict.get("error"))
+                count = self._counts.get(key, 0) + 1
+                self._counts[key] = count
+                drop = count > self.max_per_second
+                if drop:
+                    self._suppressed[event] = self._suppressed.get(event, 0) + 1
+        
+        if suppressed:
+            # Goes through the chain again; warnings are never sampled
+            structlog.get_logger(__name__).warning(
+                "Log events suppressed",
+                suppressed=sum(suppressed.values()),
+                events={str(event): count for event, count in suppressed.items()}
+            )
+        if drop:
+            raise structlog.DropEvent
+        
+        return event_dict
+
+
+class _PassthroughQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues records as-is
+
+    The default prepare() formats the record on the logging thread; skipping it
+    leaves rendering, as well as the write, to the listener thread. Safe because
+    the queue never leaves the process.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _orjson_dumps_str(obj: Any, **kwargs: Any) -> str:
+    return orjson.dumps(obj, **kwargs).decode()
+
+
+def _sampler(max_events_per_second: int) -> List[RateLimitedSampler]:
+    return [RateLimitedSampler(max_events_per_second)] if max_events_per_second > 0 else []
+
+
+def configure_logging(max_events_per_second: int = 100, background: bool = False) -> Optional[QueueListener]:
+    """
+    Configure structlog to render JSON with orjson straight to stderr
+
+    With background=True, structlog and stdlib log records are instead handed
+    to a QueueHandler on the root logger, and a QueueListener thread renders
+    and writes them, so async request handlers never block on log IO. The
+    listener is returned (and stopped at exit, flushing the queue).
+    
+    max_events_per_second <= 0 turns error sampling off.
+    """
+    if background:
+        return _configure_background_logging(max_events_per_second)
+    
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            *_sampler(max_events_per_second),
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(serializer=orjson.dumps),
+        ],
+        # orjson renders bytes, so write them to the raw stderr buffer
+        logger_factory=structlog.BytesLoggerFactory(file=sys.stderr.buffer),
+        cache_logger_on_first_use=True,
+    )
+
+
+def _configure_background_logging(max_events_per_second: int) -> QueueListener:
+    """Route structlog through stdlib logging into a queue drained by a listener thread"""
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.stdlib.filter_by_level,
+            structlog.processors.add_log_level,
+            *_sampler(max_events_per_second),
+            structlog.processors.TimeStamper(fmt="iso"),
+            # exc_info=True must be resolved on the thread handling the exception
+            structlog.processors.format_exc_info,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+    
+    # Runs on the listener thread, for structlog events and plain stdlib records alike
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps_str),
+        ],
+        foreign_pre_chain=[
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+        ],
+    ))
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    
+    # Replace any handlers installed at import time (e.g. logging.basicConfig)
+    root = logging.getLogger()
+    root.handlers = [_PassthroughQueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+    
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,21 @@
+"""
+Helpers for Alembic migration scripts
+"""
+from alembic import op
+
+
+def execute_concurrently(sql: str) -> None:
+    """
+    Run a CONCURRENTLY statement (e.g. CREATE INDEX CONCURRENTLY)
+
+    PostgreSQL refuses to run these inside a transaction block, so the
+    connection is switched to AUTOCOMMIT for the duration of the statement.
+    Concurrent builds don't take an ACCESS EXCLUSIVE lock, so the migration
+    statement_timeout is lifted while they run.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("SET statement_timeout = 0")
+        try:
+            op.execute(sql)
+        finally:
+            op.execute("RESET statement_timeout")
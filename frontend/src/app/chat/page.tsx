@@ -396,7 +396,7 @@ export default function ChatPage() {
                   setMessages(prev => [...prev.slice(0, -1), toolMessage, { ...prev[prev.length - 1], content: assistantContent }])
                   
                   // Check if agent is creating suggestions or showing calendar widget
-                  if (data.data.name === 'show_suggested_events_carousel' || data.data.name === 'suggest_calendar_event') {
+                  if (data.data.name === 'show_suggested_events_carousel' || data.data.name === 'suggest_calendar_event' || data.data.name === 'suggest_calendar_events_bulk') {
                     // Show calendar widget when agent creates suggestions
                     setTimeout(() => {
                       showCalendarWidgetHandler()